@@ -0,0 +1,219 @@
+"""Offline benchmark of the gesture classifier, no camera or model needed.
+
+Runs the rules in pose_control over synthetic hands in the poses each mode
+is meant to recognise, and over labeled landmark datasets:
+
+    python benchmark.py                          # synthetic hands only
+    python benchmark.py --noise 0.01 --samples 5000
+    python benchmark.py sessions/run1.trace labeled.npz --min-accuracy 0.95
+
+A .npz dataset holds "landmarks" (N, 21, 3), "labels" (N action labels)
+and optionally "modes" (N mode names, default game). A .trace file is
+scored against the actions recorded with it, which shows what a rule or
+threshold change would alter. Reports classification throughput and a
+confusion matrix per mode; exits non-zero if accuracy falls below
+--min-accuracy.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from classes.Action import Action
+from classes.LandmarkTrace import MODES, LandmarkTrace
+from pose_control import (
+    FINGER_MCPS,
+    FINGER_TIPS,
+    THUMB_CHAIN,
+    WRIST,
+    classify_batch,
+    classify_landmarks,
+)
+
+# A flat right hand in image coordinates (y grows downwards), thumb on the
+# left as seen by the mirrored webcam.
+WRIST_POSITION = np.array([0.5, 0.8])
+MCP_POSITIONS = np.array([[0.44, 0.6], [0.48, 0.58], [0.52, 0.59], [0.56, 0.62]])
+THUMB_EXTENDED = np.array([[0.30, 0.68], [0.35, 0.70], [0.40, 0.72]])  # tip, ip, mcp
+# Folded: the tip curls back in over the palm, breaking the tip-ip-mcp order.
+THUMB_FOLDED = np.array([[0.40, 0.66], [0.36, 0.70], [0.40, 0.73]])
+THUMB_CMC = np.array([0.45, 0.76])
+
+# The action each synthetic pose should give, written out independently of
+# gestures/*.json so that a rule change shows up as an accuracy change.
+# Patterns list thumb, index, middle, ring, pinky; 1 is extended.
+EXPECTED_POSES = {
+    "game": {
+        "00000": "left",
+        "11111": "right",
+        "01000": "jump",
+        "11000": "jump",
+        "01100": "boost",
+        "11100": "boost",
+        "10000": "idle",
+        "00100": "idle",
+        "00011": "idle",
+    },
+    "menu": {
+        "11000": "confirm_select",
+        "01110": "menu_2",
+        "01100": "menu_1",
+        "01000": "menu_0",
+        "10000": "menu_0",
+        "00000": "idle",
+        "11111": "idle",
+        "00100": "idle",
+    },
+}
+
+
+def pattern_mask(pattern):
+    """Turns a "thumb index middle ring pinky" 0/1 pattern into a finger mask."""
+    return sum(1 << finger for finger, state in enumerate(pattern) if state == "1")
+
+
+def synthetic_hands(mask, count, rng, noise=0.005, extended=(1.0, 1.5), folded=(0.15, 0.5), rotation=20.0):
+    """Generates ``count`` (21, 3) hands whose fingers follow a 5-bit mask.
+
+    Extended fingers get a tip-to-MCP ratio drawn from ``extended``, folded
+    ones from ``folded``; each hand is then rotated by up to ``rotation``
+    degrees, scaled, moved and given Gaussian landmark noise of ``noise``.
+    """
+    hands = np.zeros((count, 21, 2))
+    hands[:, WRIST] = WRIST_POSITION
+    hands[:, 1] = THUMB_CMC
+    hands[:, THUMB_CHAIN] = THUMB_EXTENDED if mask & 1 else THUMB_FOLDED
+
+    base_size = np.linalg.norm(WRIST_POSITION - MCP_POSITIONS[3])
+    for finger, (tip, mcp) in enumerate(zip(FINGER_TIPS, FINGER_MCPS)):
+        is_extended = mask & (1 << (finger + 1))
+        low, high = extended if is_extended else folded
+        length = rng.uniform(low, high, count) * base_size
+        # Extended fingers point up, folded ones curl back towards the palm.
+        direction = np.array([0.0, -1.0]) if is_extended else np.array([0.0, 1.0])
+        hands[:, mcp] = MCP_POSITIONS[finger]
+        for joint, share in zip(range(mcp + 1, tip + 1), (0.45, 0.75, 1.0)):
+            hands[:, joint] = MCP_POSITIONS[finger] + direction * (length * share)[:, None]
+
+    angle = np.radians(rng.uniform(-rotation, rotation, count))
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotate = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], -2)
+    scale = rng.uniform(0.7, 1.3, count)[:, None, None]
+    shift = rng.uniform(-0.1, 0.1, (count, 1, 2))
+    centred = hands - WRIST_POSITION
+    hands = (centred @ rotate.transpose(0, 2, 1)) * scale + WRIST_POSITION + shift
+    hands += rng.normal(0.0, noise, hands.shape)
+
+    points = np.zeros((count, 21, 3), dtype=np.float32)
+    points[..., :2] = hands
+    points[..., 2] = rng.normal(0.0, noise, (count, 21))
+    return points
+
+
+def synthetic_dataset(mode, samples, rng, **kwargs):
+    """Synthetic hands for every pose of a mode, ``samples`` per pose.
+
+    Each hand is labeled with its pose's entry in EXPECTED_POSES, never with
+    what the gesture table makes of it.
+    """
+    points, labels = [], []
+    for pattern, label in EXPECTED_POSES[mode].items():
+        points.append(synthetic_hands(pattern_mask(pattern), samples, rng, **kwargs))
+        labels.append(np.full(samples, Action.from_label(label), dtype=np.uint8))
+    return np.concatenate(points), np.concatenate(labels)
+
+
+def load_dataset(path):
+    """Returns {mode: (landmarks, labels)} for a .npz or .trace file."""
+    if path.endswith(".trace"):
+        trace = LandmarkTrace(path)
+        present = trace.hand_present()
+        return {
+            mode: (trace.landmarks[selected], trace.actions[selected].astype(np.uint8))
+            for code, mode in enumerate(MODES)
+            for selected in [present & (trace.modes == code)]
+            if selected.any()
+        }
+
+    data = np.load(path)
+    landmarks = data["landmarks"].astype(np.float32)
+    labels = np.array([Action.from_label(str(label)) for label in data["labels"]], dtype=np.uint8)
+    modes = data["modes"].astype(str) if "modes" in data.files else np.full(len(labels), "game")
+    return {
+        mode: (landmarks[modes == mode], labels[modes == mode])
+        for mode in MODES
+        if (modes == mode).any()
+    }
+
+
+def confusion_matrix(truth, predicted):
+    matrix = np.zeros((len(Action), len(Action)), dtype=np.int64)
+    np.add.at(matrix, (truth, predicted), 1)
+    return matrix
+
+
+def measure_throughput(points, mode, factor, repeats=5):
+    """Frames per second of the batch classifier and of the per-frame path."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        classify_batch(points, mode, factor)
+        best = min(best, time.perf_counter() - started)
+    batch_fps = len(points) / best
+
+    sample = points[:2000]
+    started = time.perf_counter()
+    for hand in sample:
+        classify_landmarks(hand, mode, factor)
+    frame_fps = len(sample) / (time.perf_counter() - started)
+    return batch_fps, frame_fps
+
+
+def report(name, mode, points, labels, factor):
+    predicted = classify_batch(points, mode, factor)
+    matrix = confusion_matrix(labels, predicted)
+    used = [action for action in Action if matrix[action].any() or matrix[:, action].any()]
+    accuracy = float(np.trace(matrix)) / max(len(labels), 1)
+    batch_fps, frame_fps = measure_throughput(points, mode, factor)
+
+    print("== {} / {}: {} hands ==".format(name, mode, len(labels)))
+    print("throughput: {:,.0f} fps batched, {:,.0f} fps per frame".format(batch_fps, frame_fps))
+    print("accuracy: {:.2%}  misfires: {:.2%}".format(accuracy, 1.0 - accuracy))
+    width = max(len(action.label) for action in used) + 2
+    print("truth \\ predicted".ljust(width) + "".join(action.label.rjust(width) for action in used))
+    for truth in used:
+        print(truth.label.ljust(width) + "".join(str(matrix[truth, action]).rjust(width) for action in used))
+    print()
+    return accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture classifier offline.")
+    parser.add_argument("datasets", nargs="*", help="labeled .npz or .trace landmark files")
+    parser.add_argument("--samples", type=int, default=2000, help="synthetic hands per pose")
+    parser.add_argument("--noise", type=float, default=0.005, help="synthetic landmark noise")
+    parser.add_argument("--factor", type=float, default=0.75, help="extension_threshold_factor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-synthetic", action="store_true")
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    args = parser.parse_args()
+
+    accuracies = []
+    if not args.no_synthetic:
+        rng = np.random.default_rng(args.seed)
+        for mode in MODES:
+            points, labels = synthetic_dataset(mode, args.samples, rng, noise=args.noise)
+            accuracies.append(report("synthetic", mode, points, labels, args.factor))
+    for path in args.datasets:
+        for mode, (points, labels) in load_dataset(path).items():
+            accuracies.append(report(path, mode, points, labels, args.factor))
+
+    if args.min_accuracy is not None and accuracies and min(accuracies) < args.min_accuracy:
+        print("FAIL: accuracy {:.2%} below {:.2%}".format(min(accuracies), args.min_accuracy))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
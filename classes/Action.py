@@ -0,0 +1,33 @@
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    """Everything the gesture classifier can emit; the value is its trace code."""
+
+    IDLE = 0
+    LEFT = 1
+    RIGHT = 2
+    JUMP = 3
+    BOOST = 4
+    MENU_0 = 5
+    MENU_1 = 6
+    MENU_2 = 7
+    CONFIRM_SELECT = 8
+
+    @property
+    def label(self):
+        return self.name.lower()
+
+    @property
+    def menu_index(self):
+        """The 0-based option a MENU_n action selects, otherwise None."""
+        if Action.MENU_0 <= self <= Action.MENU_2:
+            return self - Action.MENU_0
+        return None
+
+    @classmethod
+    def from_label(cls, label):
+        try:
+            return cls[label.upper()]
+        except KeyError:
+            raise ValueError("Unknown gesture action: {}".format(label))
@@ -7,10 +7,17 @@ class Camera:
         self.entity = entity
         self.x = self.pos.x * 32
         self.y = self.pos.y * 32
+        self.lastPosX = self.pos.x
 
     def move(self):
+        self.lastPosX = self.pos.x
         xPosFloat = self.entity.getPosIndexAsFloat().x
         if 10 < xPosFloat < 50:
             self.pos.x = -xPosFloat + 10
         self.x = self.pos.x * 32
         self.y = self.pos.y * 32
+
+    def interpolate(self, alpha):
+        """A copy placed ``alpha`` of the way from the last tick to this one."""
+        posX = self.lastPosX + (self.pos.x - self.lastPosX) * alpha
+        return Camera(Vec2D(posX, self.pos.y), self.entity)
@@ -1,5 +1,6 @@
 import pygame
 
+from classes.FixedTimestep import TICKS_PER_SECOND
 from classes.Font import Font
 
 
@@ -14,7 +15,14 @@ class Dashboard(Font):
         self.ticks = 0
         self.time = 0
 
-    def update(self):
+    def step(self):
+        # update Time, once per simulation tick
+        self.ticks += 1
+        if self.ticks == TICKS_PER_SECOND:
+            self.ticks = 0
+            self.time += 1
+
+    def draw(self):
         self.drawText("MARIO", 50, 20, 15)
         self.drawText(self.pointString(), 50, 37, 15)
 
@@ -27,12 +35,6 @@ class Dashboard(Font):
         if self.state != "menu":
             self.drawText(self.timeString(), 535, 37, 15)
 
-        # update Time
-        self.ticks += 1
-        if self.ticks == 60:
-            self.ticks = 0
-            self.time += 1
-
     def drawText(self, text, x, y, size):
         for char in text:
             charSprite = pygame.transform.scale(self.charSprites[char], (size, size))
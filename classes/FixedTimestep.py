@@ -0,0 +1,45 @@
+import time
+
+# Simulation rate the game logic and its constants (speeds, gravity,
+# invincibility frames, the dashboard clock) are tuned for.
+TICKS_PER_SECOND = 60
+
+
+class FixedTimestep:
+    """Accumulator that turns real time into whole simulation ticks.
+
+    Each render frame calls advance(), which returns how many fixed ticks of
+    1 / ticksPerSecond to run: none if the frame came early, several if it
+    came late. Time beyond maxSteps ticks is dropped so a long stall (camera,
+    inference, a blocking dialog) cannot make the game fast-forward.
+    alpha is the fraction of a tick left over, for interpolating drawing.
+    """
+
+    def __init__(self, ticksPerSecond=TICKS_PER_SECOND, maxSteps=5):
+        self.dt = 1.0 / ticksPerSecond
+        self.maxSteps = maxSteps
+        self.ticks = 0
+        self.reset()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.lastTime = None
+
+    def advance(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.lastTime is None:
+            # The first frame runs one tick, so something is drawn at once.
+            self.lastTime = now
+            self.accumulator = self.dt
+        else:
+            self.accumulator += now - self.lastTime
+            self.lastTime = now
+        self.accumulator = min(self.accumulator, self.maxSteps * self.dt)
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.dt
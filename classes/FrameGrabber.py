@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class FrameGrabber:
+    """Reads a capture device on a background thread.
+
+    Only the newest frames are kept in a small ring buffer, so consumers
+    always see the latest image and stale frames are dropped instead of
+    queueing up behind a slow reader. Frames come with their monotonic
+    capture time, as reported by the FrameSource.
+    """
+
+    def __init__(self, cap, buffer_size=2, timer=None):
+        self.cap = cap
+        self.timer = timer
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.buffer = deque(maxlen=buffer_size)
+        self.frame_id = 0
+        self.dropped = 0
+        self.running = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while self.running:
+            started = time.perf_counter()
+            ret, frame = self.cap.read()
+            captured_at = self.cap.captured_at
+            if self.timer is not None:
+                self.timer.record("capture", time.perf_counter() - started)
+            if not ret:
+                time.sleep(0.005)
+                continue
+            with self.condition:
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.dropped += 1
+                self.frame_id += 1
+                self.buffer.append((self.frame_id, frame, captured_at))
+                self.condition.notify_all()
+
+    def latest(self):
+        with self.condition:
+            if not self.buffer:
+                return 0, None, None
+            return self.buffer[-1]
+
+    def wait_newer(self, frame_id, timeout=0.5):
+        """Block until a frame newer than ``frame_id`` arrives and return it."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: not self.running or (self.buffer and self.buffer[-1][0] > frame_id),
+                timeout,
+            )
+            if not self.buffer or self.buffer[-1][0] <= frame_id:
+                return frame_id, None, None
+            return self.buffer[-1]
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
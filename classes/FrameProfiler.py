@@ -0,0 +1,220 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+from classes import Log
+from classes.FixedTimestep import TICKS_PER_SECOND
+
+log = Log.getLogger("game")
+
+# Stages of one game loop frame, in the order they are stacked in the graph.
+STAGES = ("gesture", "entities", "mario", "dashboard", "tiles", "sprites", "webcam", "display")
+COLORS = {
+    "gesture": (230, 90, 200),
+    "entities": (240, 160, 40),
+    "mario": (230, 60, 50),
+    "dashboard": (240, 230, 80),
+    "tiles": (60, 170, 240),
+    "sprites": (90, 210, 110),
+    "webcam": (160, 120, 240),
+    "display": (250, 250, 250),
+    "other": (110, 110, 110),
+}
+
+
+class FrameProfiler:
+    """Rolling per-stage frame times of the game loop, with an overlay.
+
+    Each frame is bracketed by beginFrame() and endFrame(); stages inside it
+    are timed with measure() and add up, so a stage run once per simulation
+    tick counts every tick of the frame. Time not covered by any stage shows
+    as "other". Waiting for the next frame is left out, so a bar's height is
+    the work done, and anything above the budget line is what made a frame
+    late. The ``worst`` slowest frames of the window get a marker.
+    """
+
+    def __init__(self, stages=STAGES, window=240, budget=1.0 / TICKS_PER_SECOND, worst=3, refresh=0.25,
+                 visible=False):
+        self.stages = list(stages) + ["other"]
+        self.index = {stage: column for column, stage in enumerate(self.stages)}
+        self.window = window
+        self.budget = budget
+        self.worst = worst
+        self.refresh = refresh
+        self.frames = np.zeros((window, len(self.stages)))
+        self.current = np.zeros(len(self.stages))
+        self.head = 0
+        self.count = 0
+        self.overBudget = 0
+        self.frameStart = None
+        self.visible = visible
+
+        self.graphHeight = 80
+        self.graph = None
+        self.graphValid = False
+        self.legend = None
+        self.legendTime = None
+        self.font = None
+
+    def reset(self):
+        self.frames[:] = 0.0
+        self.head = 0
+        self.count = 0
+        self.overBudget = 0
+        self.graphValid = False
+
+    def toggle(self):
+        """Shows or hides the overlay; timings are kept either way."""
+        self.visible = not self.visible
+
+    def beginFrame(self):
+        self.current[:] = 0.0
+        self.frameStart = time.perf_counter()
+
+    def discardFrame(self):
+        """Drops the frame begun last, e.g. one spent in the pause menu."""
+        self.frameStart = None
+
+    def record(self, stage, seconds):
+        self.current[self.index[stage]] += seconds
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def endFrame(self):
+        if self.frameStart is None:
+            return
+        total = time.perf_counter() - self.frameStart
+        self.frameStart = None
+        self.current[-1] = max(total - self.current[:-1].sum(), 0.0)
+        self.frames[self.head] = self.current
+        self.head = (self.head + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        if total > self.budget:
+            self.overBudget += 1
+            stage = self.stages[int(np.argmax(self.current))]
+            log.debug("Slow frame: %.1f ms, %.1f ms of it %s", total * 1000.0, self.current.max() * 1000.0, stage)
+        if self.visible and self.graphValid:
+            self._scrollGraph()
+
+    def history(self):
+        """Per-stage seconds of the frames in the window, oldest first."""
+        if self.count < self.window:
+            return self.frames[:self.count]
+        return np.roll(self.frames, -self.head, axis=0)
+
+    def worstFrames(self):
+        """Indices into history() of the slowest frames, slowest first."""
+        totals = self.history().sum(axis=1)
+        count = min(self.worst, len(totals))
+        return np.argsort(totals)[::-1][:count]
+
+    def stats(self):
+        """Mean, max and last ms per stage over the window, plus frame totals."""
+        history = self.history() * 1000.0
+        if not len(history):
+            return {}
+        stats = {
+            stage: {
+                "mean": float(history[:, column].mean()),
+                "max": float(history[:, column].max()),
+                "last": float(history[-1, column]),
+            }
+            for stage, column in self.index.items()
+        }
+        totals = history.sum(axis=1)
+        worst = int(np.argmax(totals))
+        stats["frame"] = {
+            "mean": float(totals.mean()),
+            "max": float(totals[worst]),
+            "last": float(totals[-1]),
+            "count": len(totals),
+            "overBudget": self.overBudget,
+            # Which stage made the slowest frame in the window slow.
+            "worstStage": self.stages[int(np.argmax(history[worst]))],
+        }
+        return stats
+
+    def draw(self, screen, pos=None):
+        """Blits the graph and legend; does nothing while hidden."""
+        if not self.visible:
+            self.graphValid = False
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 16)
+        if not self.graphValid:
+            self._buildGraph()
+        now = time.perf_counter()
+        if self.legendTime is None or now - self.legendTime >= self.refresh:
+            self._buildLegend()
+            self.legendTime = now
+
+        if pos is None:
+            pos = (screen.get_width() - self.window - 10, 70)
+        x, y = pos
+        screen.blit(self.graph, pos)
+        # Worst frame markers above their bars.
+        start = self.window - self.count
+        for rank, frame in enumerate(self.worstFrames()):
+            column = x + start + int(frame)
+            color = (255, 40, 40) if rank == 0 else (255, 150, 150)
+            pygame.draw.polygon(screen, color, [(column - 3, y - 6), (column + 3, y - 6), (column, y - 1)])
+        screen.blit(self.legend, (x, y + self.graphHeight + 4))
+
+    def _barHeight(self, seconds):
+        # The budget sits at half height, leaving room to see how far over it went.
+        return int(round(seconds / (2.0 * self.budget) * self.graphHeight))
+
+    def _drawBar(self, column, frame):
+        bottom = self.graphHeight
+        for stage, seconds in zip(self.stages, frame):
+            height = min(self._barHeight(seconds), bottom)
+            if height:
+                bottom -= height
+                self.graph.fill(COLORS[stage], (column, bottom, 1, height))
+        budgetY = self.graphHeight - self._barHeight(self.budget)
+        self.graph.set_at((column, budgetY), (255, 255, 255))
+
+    def _buildGraph(self):
+        if self.graph is None:
+            self.graph = pygame.Surface((self.window, self.graphHeight))
+            self.graph.set_alpha(200)
+        self.graph.fill((20, 20, 30))
+        start = self.window - self.count
+        for column, frame in enumerate(self.history()):
+            self._drawBar(start + column, frame)
+        budgetY = self.graphHeight - self._barHeight(self.budget)
+        pygame.draw.line(self.graph, (255, 255, 255), (0, budgetY), (self.window - 1, budgetY))
+        self.graphValid = True
+
+    def _scrollGraph(self):
+        # Only the newest frame's bar is drawn; the rest shifts left a pixel.
+        self.graph.scroll(-1, 0)
+        self.graph.fill((20, 20, 30), (self.window - 1, 0, 1, self.graphHeight))
+        self._drawBar(self.window - 1, self.frames[self.head - 1])
+
+    def _buildLegend(self):
+        stats = self.stats()
+        lineHeight = 12
+        self.legend = pygame.Surface((self.window, lineHeight * (len(self.stages) + 1) + 4))
+        self.legend.set_alpha(200)
+        self.legend.fill((20, 20, 30))
+        if not stats:
+            return
+        frame = stats["frame"]
+        header = "frame avg / max {:.1f} / {:.1f} ms, {} late".format(frame["mean"], frame["max"], frame["overBudget"])
+        self.legend.blit(self.font.render(header, True, (255, 255, 255)), (2, 2))
+        for line, stage in enumerate(self.stages, 1):
+            top = 2 + line * lineHeight
+            self.legend.fill(COLORS[stage], (2, top + 2, 8, 8))
+            color = (255, 120, 120) if stage == frame["worstStage"] else (220, 220, 220)
+            times = "{:.2f} / {:.2f}".format(stats[stage]["mean"], stats[stage]["max"])
+            self.legend.blit(self.font.render(stage, True, color), (14, top))
+            self.legend.blit(self.font.render(times, True, color), (90, top))
@@ -0,0 +1,297 @@
+import abc
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+# Capture times saved next to a recording, in seconds from its first frame.
+TIMESTAMPS_NAME = "timestamps.txt"
+
+
+def timestamps_path(path):
+    """Where the capture times of a recording at ``path`` are kept."""
+    if os.path.isdir(path) or not os.path.splitext(path)[1]:
+        return os.path.join(path, TIMESTAMPS_NAME)
+    return path + "." + TIMESTAMPS_NAME
+
+
+def load_timestamps(path):
+    """The recorded capture times of a recording, or None if it has none."""
+    sidecar = timestamps_path(path)
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar) as timestampFile:
+        return [float(line) for line in timestampFile if line.strip()]
+
+
+class FrameSource(abc.ABC):
+    """Base for everything PoseControl can read frames from.
+
+    Mirrors the parts of cv2.VideoCapture the pose layer uses, so a live
+    device, a video file and a directory of frames are interchangeable. If a
+    recorder is attached, every frame read is also handed to it. After each
+    read, captured_at holds the frame's monotonic capture time: the time of
+    the read for a live source, the recorded time for a replayed recording
+    that has its timestamps (``timestamps`` is then set).
+    """
+
+    def __init__(self):
+        self.recorder = None
+        self.captured_at = None
+        self.timestamps = None
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        ret, frame = self._read(image)
+        self.captured_at = self._captured_at() if ret else None
+        if ret and self.recorder is not None:
+            self.recorder.write(frame, self.captured_at)
+        return ret, frame
+
+    @abc.abstractmethod
+    def _read(self, image):
+        """Reads the next frame, into ``image`` if given, as (ret, frame)."""
+
+    def _captured_at(self):
+        return time.monotonic()
+
+    def get(self, prop):
+        return 0
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+
+
+class DeviceSource(FrameSource):
+    def __init__(self, index=0):
+        super(DeviceSource, self).__init__()
+        self.cap = cv2.VideoCapture(index)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _read(self, image):
+        if image is None:
+            return self.cap.read()
+        return self.cap.read(image)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        super(DeviceSource, self).release()
+        self.cap.release()
+
+
+class RecordingSource(FrameSource):
+    """Shared playback of a recording: timestamps, pacing and looping.
+
+    With the recording's timestamps, each frame gets its recorded capture
+    time, moved onto this session's clock, and realtime playback follows the
+    recorded intervals; without them frames are frame_time apart.
+    """
+
+    def __init__(self, path, fps, loop=False, realtime=False):
+        super(RecordingSource, self).__init__()
+        self.loop = loop
+        self.realtime = realtime
+        self.frame_time = 1.0 / fps
+        self.timestamps = load_timestamps(path)
+        self.index = 0
+        self.clock_start = None
+
+    def _frame_offset(self, index):
+        if self.timestamps is not None and index < len(self.timestamps):
+            return self.timestamps[index]
+        return index * self.frame_time
+
+    def _rewind(self):
+        # A loop carries on from where the last pass ended.
+        if self.clock_start is not None:
+            self.clock_start += self._frame_offset(self.index - 1) + self.frame_time
+        self.index = 0
+
+    def _pace(self):
+        # Realtime playback hands out frames no faster than they were captured.
+        offset = self._frame_offset(self.index)
+        if self.clock_start is None:
+            self.clock_start = time.monotonic() - offset
+        if self.realtime:
+            delay = self.clock_start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.index += 1
+
+    def _captured_at(self):
+        if self.timestamps is None:
+            return time.monotonic()
+        return self.clock_start + self._frame_offset(self.index - 1)
+
+
+class VideoFileSource(RecordingSource):
+    """Plays back a recorded video, optionally paced at its own frame rate."""
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        super(VideoFileSource, self).__init__(path, fps if fps > 0 else 30, loop, realtime)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _read(self, image):
+        self._pace()
+        ret, frame = self._read_video(image)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._rewind()
+            self._pace()
+            ret, frame = self._read_video(image)
+        return ret, frame
+
+    def _read_video(self, image):
+        if image is None:
+            return self.cap.read()
+        return self.cap.read(image)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        # Buffer tuning is meant for live devices; it would rewind a file.
+        return False
+
+    def release(self):
+        super(VideoFileSource, self).release()
+        self.cap.release()
+
+
+class ImageDirSource(RecordingSource):
+    """Plays back a directory of frames in file-name order."""
+
+    def __init__(self, path, fps=30, loop=False, realtime=False):
+        super(ImageDirSource, self).__init__(path, fps, loop, realtime)
+        self.files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.shape = None
+        if self.files:
+            self.shape = cv2.imread(self.files[0]).shape
+
+    def isOpened(self):
+        return bool(self.files)
+
+    def _read(self, image):
+        if self.index >= len(self.files):
+            if not self.loop or not self.files:
+                return False, None
+            self._rewind()
+        self._pace()
+        frame = cv2.imread(self.files[self.index - 1])
+        if frame is None:
+            return False, None
+        if image is not None:
+            image[...] = frame
+            frame = image
+        return True, frame
+
+    def get(self, prop):
+        if self.shape is None:
+            return 0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.shape[0]
+        if prop == cv2.CAP_PROP_FPS:
+            return 1.0 / self.frame_time
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.files)
+        return 0
+
+
+def open_source(spec=0, **kwargs):
+    """Builds a source from a device index, a video file or a frame directory."""
+    if isinstance(spec, FrameSource):
+        return spec
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return DeviceSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, **kwargs)
+    return VideoFileSource(spec, **kwargs)
+
+
+class FrameRecorder:
+    """Writes frames to disk on a background thread.
+
+    ``write`` never blocks: frames are queued and, if the disk cannot keep
+    up, dropped and counted. A path with a video extension is written with
+    cv2.VideoWriter, any other path is treated as a directory of numbered
+    PNG files, which replays losslessly through ImageDirSource. The capture
+    time of every written frame goes to a timestamps sidecar, so playback
+    reproduces the session's timing.
+    """
+
+    def __init__(self, path, fps=30, fourcc="mp4v", max_queue=64):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.to_directory = not os.path.splitext(path)[1]
+        if self.to_directory:
+            os.makedirs(path, exist_ok=True)
+        self.writer = None
+        self.timestamps = open(timestamps_path(path), "w")
+        self.first_timestamp = None
+        self.count = 0
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self.thread.start()
+
+    def write(self, frame, captured_at=None):
+        captured_at = time.monotonic() if captured_at is None else captured_at
+        try:
+            self.queue.put_nowait((frame.copy(), captured_at))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, captured_at = item
+            if self.to_directory:
+                cv2.imwrite(os.path.join(self.path, "frame_{:06d}.png".format(self.count)), frame)
+            else:
+                if self.writer is None:
+                    height, width = frame.shape[:2]
+                    self.writer = cv2.VideoWriter(
+                        self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height)
+                    )
+                self.writer.write(frame)
+            if self.first_timestamp is None:
+                self.first_timestamp = captured_at
+            self.timestamps.write("{:.6f}\n".format(captured_at - self.first_timestamp))
+            self.count += 1
+        if self.writer is not None:
+            self.writer.release()
+        self.timestamps.close()
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
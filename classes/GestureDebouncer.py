@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+
+
+class GestureDebouncer:
+    """Turns the raw per-frame action stream into confirmed actions.
+
+    Every raw action is scored by its share of a short sliding time window.
+    The most frequent action other than the confirmed one is the candidate;
+    it is confirmed once its share reaches its enter threshold and it has
+    been the candidate for its minimum hold time. The confirmed action is
+    kept as long as its own share stays at or above its exit threshold, even
+    if another action leads, so a borderline mix of two gestures or a
+    single-frame misclassification never switches it. Once released it makes
+    way for the candidate if that one qualifies, otherwise for idle. Idle
+    itself has no exit threshold, so each gesture's enter threshold alone
+    decides how quickly it is picked up. Each change of the confirmed action
+    is recorded as a timestamped event.
+    """
+
+    def __init__(self, window=0.2, enter=0.6, exit=0.3, hold=0.0, thresholds=None, idle="idle"):
+        self.idle = idle
+        self.lock = threading.Lock()
+        self.events = deque(maxlen=64)
+        self.configure(window, enter, exit, hold, thresholds)
+
+    def configure(self, window=0.2, enter=0.6, exit=0.3, hold=0.0, thresholds=None):
+        """Sets the defaults and the per-action (enter, exit, hold) overrides."""
+        with self.lock:
+            self.window = window
+            self.defaults = (enter, exit, hold)
+            self.thresholds = dict(thresholds or {})
+            self._reset()
+
+    def reset(self):
+        with self.lock:
+            self._reset()
+
+    def _reset(self):
+        self.samples = deque()
+        self.counts = {}
+        self.confirmed = self.idle
+        self.confirmed_at = time.monotonic()
+        self.candidate = None
+        self.candidate_since = 0.0
+        self.events.clear()
+
+    def update(self, action, timestamp=None):
+        """Feeds one raw action and returns the confirmed action."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        with self.lock:
+            self.samples.append((timestamp, action))
+            self.counts[action] = self.counts.get(action, 0) + 1
+            while self.samples and timestamp - self.samples[0][0] > self.window:
+                _, old = self.samples.popleft()
+                self.counts[old] -= 1
+                if not self.counts[old]:
+                    del self.counts[old]
+
+            total = len(self.samples)
+            # The challenger is the most frequent action other than the
+            # confirmed one; it need not lead the window, only meet its own
+            # enter threshold.
+            challengers = [other for other in self.counts if other != self.confirmed]
+            if not challengers:
+                return self.confirmed
+            challenger = max(challengers, key=self.counts.get)
+            if challenger != self.candidate:
+                self.candidate = challenger
+                self.candidate_since = timestamp
+
+            _, exit, _ = self.thresholds.get(self.confirmed, self.defaults)
+            # Idle has nothing to hold on to: any gesture meeting its own
+            # enter threshold takes over at once.
+            if self.confirmed == self.idle or self.counts.get(self.confirmed, 0) / total < exit:
+                enter, _, hold = self.thresholds.get(challenger, self.defaults)
+                if self.counts[challenger] / total >= enter and timestamp - self.candidate_since >= hold:
+                    self._confirm(challenger, timestamp)
+                elif self.confirmed != self.idle:
+                    self._confirm(self.idle, timestamp)
+            return self.confirmed
+
+    def _confirm(self, action, timestamp):
+        self.confirmed = action
+        self.confirmed_at = timestamp
+        self.events.append((timestamp, action))
+
+    def held_for(self, timestamp=None):
+        """Seconds the current confirmed action has been held."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        return timestamp - self.confirmed_at
+
+    def pop_events(self):
+        """Returns and clears the (timestamp, action) confirmations so far."""
+        with self.lock:
+            events = list(self.events)
+            self.events.clear()
+        return events
@@ -0,0 +1,93 @@
+import numpy as np
+
+FINGER_BITS = 1 << np.arange(5)
+
+
+class GesturePredictor:
+    """Emits the upcoming action while a finger transition is under way.
+
+    The finger extension ratios are differentiated frame to frame and
+    smoothed; each ratio is extrapolated ``lead`` seconds ahead. A finger is
+    predicted to flip only if the extrapolated ratio clears the extension
+    threshold by ``margin``, so slow drift near the threshold never fires.
+    Every prediction is checked against what the classifier reports within
+    ``timeout`` seconds and counted as confirmed or wrong.
+    """
+
+    def __init__(self, lead=0.08, margin=0.15, alpha=0.5, timeout=0.3):
+        self.lead = lead
+        self.margin = margin
+        self.alpha = alpha
+        self.timeout = timeout
+        self.confirmed = {}
+        self.wrong = {}
+        self.reset()
+
+    def reset(self):
+        self.previous = None
+        self.previous_time = None
+        self.velocity = None
+        self.pending = None
+        self.deadline = None
+
+    def update(self, features, action, timestamp, table, extension_threshold_factor=0.75):
+        """Feeds one frame; returns the predicted Action or None.
+
+        ``features`` is the hand's extract_features() vector, or None when no
+        hand was found; ``action`` is what the classifier made of this frame
+        and ``table`` the current mode's GestureTable.
+        """
+        self._check(action, timestamp)
+        if features is None:
+            self.previous = self.previous_time = self.velocity = None
+            return None
+
+        ratios = features[1:]
+        if self.previous is not None and timestamp > self.previous_time:
+            velocity = (ratios - self.previous) / (timestamp - self.previous_time)
+            if self.velocity is None:
+                self.velocity = velocity
+            else:
+                self.velocity += self.alpha * (velocity - self.velocity)
+        self.previous = ratios.copy()
+        self.previous_time = timestamp
+        if self.velocity is None or table is None:
+            return None
+
+        extended = ratios > extension_threshold_factor
+        ahead = ratios + self.velocity * self.lead
+        opening = ~extended & (ahead > extension_threshold_factor + self.margin)
+        closing = extended & (ahead < extension_threshold_factor - self.margin)
+        if not (opening.any() or closing.any()):
+            return None
+
+        # The thumb test is an ordering, not a ratio; it is taken as is.
+        flags = np.concatenate([[features[0] > 0.5], (extended | opening) & ~closing])
+        predicted = table.lookup(int(flags @ FINGER_BITS))
+        if predicted == action:
+            return None
+        if predicted != self.pending:
+            if self.pending is not None:
+                # Changed its mind before the old prediction came true.
+                self.wrong[self.pending] = self.wrong.get(self.pending, 0) + 1
+            self.pending = predicted
+            self.deadline = timestamp + self.timeout
+        return predicted
+
+    def _check(self, action, timestamp):
+        if self.pending is None:
+            return
+        if action == self.pending:
+            self.confirmed[self.pending] = self.confirmed.get(self.pending, 0) + 1
+        elif timestamp > self.deadline:
+            self.wrong[self.pending] = self.wrong.get(self.pending, 0) + 1
+        else:
+            return
+        self.pending = self.deadline = None
+
+    def stats(self):
+        """Confirmed and wrong prediction counts per action label."""
+        return {
+            action.label: {"confirmed": self.confirmed.get(action, 0), "wrong": self.wrong.get(action, 0)}
+            for action in sorted(set(self.confirmed) | set(self.wrong))
+        }
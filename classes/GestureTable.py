@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+
+from classes.Action import Action
+
+FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+
+
+class GestureTable:
+    """A mode's gesture rules compiled into a 32-entry lookup table.
+
+    The key is the 5-bit finger-extension state, with bit i set when
+    FINGERS[i] is extended. Rules are tried in file order for every key, so
+    classifying a frame is a single array index.
+    """
+
+    def __init__(self, mode, rules, debounce=None):
+        self.mode = mode
+        self.debounce = debounce or {}
+        self.table = np.full(32, Action.IDLE, dtype=np.uint8)
+        for mask in range(32):
+            for action, required, forbidden in rules:
+                if mask & required == required and not mask & forbidden:
+                    self.table[mask] = action
+                    break
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as jsonData:
+            data = json.load(jsonData)
+        rules = []
+        for gesture in data["gestures"]:
+            rules.append(
+                (
+                    Action.from_label(gesture["action"]),
+                    _finger_mask(gesture.get("extended", [])),
+                    _finger_mask(gesture.get("folded", [])),
+                )
+            )
+        debounce = dict(data.get("debounce", {}))
+        if "thresholds" in debounce:
+            debounce["thresholds"] = {
+                Action.from_label(label): tuple(values)
+                for label, values in debounce["thresholds"].items()
+            }
+        return cls(data["mode"], rules, debounce)
+
+    def lookup(self, mask):
+        return Action(self.table[mask])
+
+
+def _finger_mask(names):
+    mask = 0
+    for name in names:
+        if name not in FINGERS:
+            raise ValueError("Unknown finger in gesture spec: {}".format(name))
+        mask |= 1 << FINGERS.index(name)
+    return mask
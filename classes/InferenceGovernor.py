@@ -0,0 +1,91 @@
+import time
+
+# Quality tiers from best to cheapest: inference input scale, MediaPipe
+# model complexity and how many frames to skip between inferences.
+DEFAULT_TIERS = [
+    {"scale": 1.0, "model_complexity": 1, "frame_skip": 0},
+    {"scale": 0.75, "model_complexity": 1, "frame_skip": 0},
+    {"scale": 0.5, "model_complexity": 0, "frame_skip": 0},
+    {"scale": 0.5, "model_complexity": 0, "frame_skip": 1},
+    {"scale": 0.35, "model_complexity": 0, "frame_skip": 2},
+]
+
+
+class InferenceGovernor:
+    """Keeps per-frame inference time inside a latency budget.
+
+    Only frames that ran inference are recorded, each spread over the frames
+    the current tier skips after it, and smoothed with an exponential moving
+    average, so the average is the cost per camera frame at that tier.
+    After ``patience`` frames over budget the governor steps down one tier;
+    after twice that many frames comfortably under budget it steps back up.
+    """
+
+    def __init__(self, budget_ms=25.0, tiers=None, alpha=0.2, patience=15, headroom=0.6):
+        self.budget_ms = budget_ms
+        self.tiers = tiers or DEFAULT_TIERS
+        self.alpha = alpha
+        self.patience = patience
+        self.headroom = headroom
+        self.tier = 0
+        self.average_ms = None
+        self.last_ms = None
+        self.over = 0
+        self.under = 0
+        self.frame_count = 0
+        self.skipped = 0
+        self.changed_at = time.monotonic()
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    def should_skip(self):
+        """True when this frame should reuse the previous result."""
+        self.frame_count += 1
+        skip = self.frame_count % (self.settings["frame_skip"] + 1) != 0
+        if skip:
+            self.skipped += 1
+        return skip
+
+    def record(self, seconds):
+        """Adds one inference's time; returns True if the tier changed."""
+        self.last_ms = seconds * 1000.0 / (self.settings["frame_skip"] + 1)
+        if self.average_ms is None:
+            self.average_ms = self.last_ms
+        else:
+            self.average_ms += self.alpha * (self.last_ms - self.average_ms)
+
+        if self.average_ms > self.budget_ms:
+            self.over += 1
+            self.under = 0
+        elif self.average_ms < self.budget_ms * self.headroom:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= self.patience and self.tier < len(self.tiers) - 1:
+            return self._set_tier(self.tier + 1)
+        if self.under >= 2 * self.patience and self.tier > 0:
+            return self._set_tier(self.tier - 1)
+        return False
+
+    def _set_tier(self, tier):
+        self.tier = tier
+        self.over = self.under = 0
+        # The new tier's cost is unknown; start its average fresh.
+        self.average_ms = None
+        self.changed_at = time.monotonic()
+        return True
+
+    def stats(self):
+        return {
+            "tier": self.tier,
+            "settings": dict(self.settings),
+            "budget_ms": self.budget_ms,
+            "average_ms": self.average_ms,
+            "last_ms": self.last_ms,
+            "frames": self.frame_count,
+            "skipped": self.skipped,
+        }
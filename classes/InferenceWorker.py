@@ -0,0 +1,145 @@
+import multiprocessing
+import queue
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+InferenceResult = namedtuple(
+    "InferenceResult", ["slot", "timestamp", "action", "fingers", "landmarks", "handedness", "timings"]
+)
+
+
+class InferenceWorker:
+    """Runs hand-landmark inference in a separate process.
+
+    Frames are exchanged through a ring of slots in shared memory; only the
+    slot index, capture timestamp, mode and quality settings cross the
+    request queue, and only the small per-frame result comes back, so frames
+    are never pickled. The settings are an InferenceGovernor tier's scale and
+    model_complexity; frame skipping happens before a frame is submitted.
+    """
+
+    def __init__(self, frame_shape, extension_threshold_factor=0.75, slots=2):
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        size = int(np.prod(self.frame_shape)) * slots
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(slots))
+        self.requests = multiprocessing.Queue(maxsize=slots)
+        self.results = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_worker_main,
+            args=(self.shm.name, self.frame_shape, slots, extension_threshold_factor,
+                  self.requests, self.results),
+            name="InferenceWorker",
+            daemon=True,
+        )
+
+    def start(self):
+        self.process.start()
+        return self
+
+    def acquire_slot(self):
+        """Returns a free slot index, or None when every slot is in flight."""
+        if not self.free_slots:
+            return None
+        return self.free_slots.pop()
+
+    def release_slot(self, index):
+        self.free_slots.append(index)
+
+    def slot(self, index):
+        return self.frames[index]
+
+    def submit(self, index, timestamp, mode, settings=None):
+        self.requests.put((index, timestamp, mode, dict(settings or {})))
+
+    def poll(self):
+        """Drains finished results and returns the newest one, if any."""
+        latest = None
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.release_slot(result.slot)
+            if latest is None or result.timestamp > latest.timestamp:
+                latest = result
+        return latest
+
+    def stop(self):
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _worker_main(shm_name, frame_shape, slots, extension_threshold_factor, requests, results):
+    import cv2
+    import mediapipe as mp
+
+    from classes.Action import Action
+    from pose_control import classify_landmarks, landmarks_to_array
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+
+    def create_hands(model_complexity):
+        return mp.solutions.hands.Hands(
+            max_num_hands=1,
+            model_complexity=model_complexity,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.6
+        )
+
+    model_complexity = 1
+    hands = create_hands(model_complexity)
+    flipped = np.empty(frame_shape, dtype=np.uint8)
+    rgb = np.empty(frame_shape, dtype=np.uint8)
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            index, timestamp, mode, settings = request
+            if settings.get("model_complexity", model_complexity) != model_complexity:
+                hands.close()
+                model_complexity = settings["model_complexity"]
+                hands = create_hands(model_complexity)
+            started = time.perf_counter()
+            cv2.flip(frames[index], 1, dst=flipped)
+            flipped_at = time.perf_counter()
+            scale = settings.get("scale", 1.0)
+            if scale < 1.0:
+                small = cv2.resize(flipped, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                image = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            else:
+                image = cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB, dst=rgb)
+            converted_at = time.perf_counter()
+            hand_result = hands.process(image)
+            inferred_at = time.perf_counter()
+
+            action, fingers, landmarks, handedness = Action.IDLE, (False,) * 5, None, None
+            if hand_result.multi_hand_landmarks:
+                landmarks = landmarks_to_array(hand_result.multi_hand_landmarks[0].landmark)
+                action, fingers = classify_landmarks(landmarks, mode, extension_threshold_factor)
+                if hand_result.multi_handedness:
+                    handedness = hand_result.multi_handedness[0].classification[0].label
+            timings = (
+                ("flip", flipped_at - started),
+                ("convert", converted_at - flipped_at),
+                ("inference", inferred_at - converted_at),
+                ("classify", time.perf_counter() - inferred_at),
+            )
+            results.put(InferenceResult(index, timestamp, action, fingers, landmarks, handedness, timings))
+    finally:
+        hands.close()
+        del frames
+        shm.close()
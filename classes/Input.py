@@ -2,12 +2,46 @@ import pygame
 from pygame.locals import *
 import sys
 
+from classes import Log
+from classes.Action import Action
+
+log = Log.getLogger("game")
+
 
 class Input:
     def __init__(self, entity):
         self.mouseX = 0
         self.mouseY = 0
         self.entity = entity
+        # FrameProfiler whose overlay F3 toggles, if the game loop has one.
+        self.profiler = None
+
+    def applyAction(self, action):
+        """Drives the entity from a confirmed gesture Action."""
+        # Reset movement states
+        self.entity.traits["goTrait"].direction = 0
+        self.entity.traits["goTrait"].brake = True
+
+        # === Debug log to confirm gesture and boost state ===
+        log.debug("Detected action: %s", action.label)
+
+        # Set boost flag
+        self.entity.traits["goTrait"].boost = (action == Action.BOOST)
+        log.debug("Boost flag set to: %s", self.entity.traits["goTrait"].boost)
+
+        # Handle jump
+        self.entity.traits["jumpTrait"].handle_jump(action == Action.JUMP)
+
+        # Apply left/right movement
+        if action == Action.LEFT:
+            self.entity.traits["goTrait"].direction = -1
+            self.entity.traits["goTrait"].brake = False
+        elif action == Action.RIGHT:
+            self.entity.traits["goTrait"].direction = 1
+            self.entity.traits["goTrait"].brake = False
+
+        if self.entity.traits["goTrait"].boost:
+            log.debug("Boost Activated!")
 
     def checkForInput(self):
         events = pygame.event.get()
@@ -59,6 +93,8 @@ class Input:
                 (event.key == pygame.K_ESCAPE or event.key == pygame.K_F5):
                 self.entity.pause = True
                 self.entity.pauseObj.createBackgroundBlur()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler is not None:
+                self.profiler.toggle()
 
     def isLeftMouseButtonPressed(self, events):
         return self.checkMouse(events, 1)
@@ -0,0 +1,84 @@
+import struct
+
+import numpy as np
+
+MAGIC = b"GCMTRACE"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+
+MODES = ("menu", "game")
+HANDEDNESS = ("Left", "Right")
+
+# One fixed-size record per processed frame. handedness is -1 when no hand
+# was found, in which case the landmarks are zero.
+TRACE_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("landmarks", "<f4", (21, 3)),
+    ("handedness", "i1"),
+    ("mode", "i1"),
+    ("action", "i1"),
+])
+
+
+class TraceWriter:
+    """Appends per-frame landmark records to a trace file.
+
+    Records are staged in a preallocated block and written out whole, so a
+    frame only costs a few field assignments on the processing thread.
+    """
+
+    def __init__(self, path, block_size=256):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, TRACE_DTYPE.itemsize))
+        self.block = np.zeros(block_size, dtype=TRACE_DTYPE)
+        self.count = 0
+
+    def write(self, timestamp, landmarks, handedness, mode, action):
+        record = self.block[self.count]
+        record["timestamp"] = timestamp
+        if landmarks is None:
+            record["landmarks"] = 0
+            record["handedness"] = -1
+        else:
+            record["landmarks"] = landmarks
+            record["handedness"] = HANDEDNESS.index(handedness) if handedness in HANDEDNESS else 1
+        record["mode"] = MODES.index(mode) if mode in MODES else -1
+        record["action"] = action
+        self.count += 1
+        if self.count == len(self.block):
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.block[:self.count].tobytes())
+        self.file.flush()
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class LandmarkTrace:
+    """Memory-maps a trace file as NumPy arrays; nothing is read up front."""
+
+    def __init__(self, path):
+        with open(path, "rb") as trace_file:
+            magic, version, itemsize = HEADER.unpack(trace_file.read(HEADER.size))
+            empty = not trace_file.read(1)
+        if magic != MAGIC or version != VERSION or itemsize != TRACE_DTYPE.itemsize:
+            raise ValueError("Not a version {} landmark trace: {}".format(VERSION, path))
+        if empty:
+            self.records = np.zeros(0, dtype=TRACE_DTYPE)
+        else:
+            self.records = np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=HEADER.size)
+        self.timestamps = self.records["timestamp"]
+        self.landmarks = self.records["landmarks"]
+        self.handedness = self.records["handedness"]
+        self.modes = self.records["mode"]
+        self.actions = self.records["action"]
+
+    def __len__(self):
+        return len(self.records)
+
+    def hand_present(self):
+        return self.handedness >= 0
@@ -1,4 +1,5 @@
 import json
+import random
 import pygame
 
 from classes.Sprites import Sprites
@@ -13,8 +14,13 @@ from entities.RandomBox import RandomBox
 
 
 class Level:
-    def __init__(self, screen, sound, dashboard):
+    def __init__(self, screen, sound, dashboard, seed=None):
         self.sprites = Sprites()
+        # Everything random in a level draws from this generator; the seed
+        # is kept so a run can be replayed exactly.
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.random = random.Random(self.seed)
+        self.levelName = None
         self.dashboard = dashboard
         self.sound = sound
         self.screen = screen
@@ -23,6 +29,7 @@ class Level:
         self.entityList = []
 
     def loadLevel(self, levelname):
+        self.levelName = levelname
         with open("./levels/{}.json".format(levelname)) as jsonData:
             data = json.load(jsonData)
             self.loadLayers(data)
@@ -77,12 +84,23 @@ class Level:
                 pygame.Rect(x * 32, y * 32, 32, 32),
             )
 
-    def updateEntities(self, cam):
-        for entity in self.entityList:
-            entity.update(cam)
+    def step(self):
+        for entity in list(self.entityList):
+            entity.lastX, entity.lastY = entity.rect.x, entity.rect.y
+            entity.step()
             if entity.alive is None:
                 self.entityList.remove(entity)
 
+    def draw(self, camera, alpha=1.0):
+        self.drawLevel(camera)
+        self.drawEntities(camera, alpha)
+
+    def drawEntities(self, camera, alpha=1.0):
+        # Entities move between ticks like the camera, so draw them at the
+        # same interpolated moment or they jitter against the scrolling.
+        for entity in self.entityList:
+            entity.drawInterpolated(camera, alpha)
+
     def drawLevel(self, camera):
         try:
             for y in range(0, 15):
@@ -96,7 +114,6 @@ class Level:
                         self.level[y][x].sprite.drawSprite(
                             x + camera.pos.x, y, self.screen
                         )
-            self.updateEntities(camera)
         except IndexError:
             return
 
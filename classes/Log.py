@@ -0,0 +1,129 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT = "mario"
+DEFAULT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener = None
+
+
+def getLogger(subsystem):
+    """Logger for one subsystem, e.g. "pose", "game" or "traits"."""
+    return logging.getLogger("{}.{}".format(ROOT, subsystem))
+
+
+class RingQueue:
+    """Bounded queue for QueueHandler that drops the oldest record when full.
+
+    Logging from the game loop therefore never blocks, however far the
+    writer thread falls behind.
+    """
+
+    def __init__(self, capacity=1024):
+        self.records = deque(maxlen=capacity)
+        self.dropped = 0
+        self.condition = threading.Condition()
+
+    def put_nowait(self, record):
+        with self.condition:
+            if len(self.records) == self.records.maxlen:
+                self.dropped += 1
+            self.records.append(record)
+            self.condition.notify()
+
+    def get(self, block=True, timeout=None):
+        with self.condition:
+            if block:
+                self.condition.wait_for(lambda: self.records, timeout)
+            if not self.records:
+                raise queue.Empty
+            return self.records.popleft()
+
+
+class SamplingFilter(logging.Filter):
+    """Lets each message through at most ``rate`` times per second.
+
+    Messages are told apart by logger and format string, so a per-frame debug
+    line is thinned out without hiding other messages. Records at WARNING and
+    above are never sampled.
+    """
+
+    def __init__(self, rate=5.0):
+        super().__init__()
+        self.interval = 1.0 / rate if rate else 0.0
+        self.last_seen = {}
+        self.suppressed = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.interval:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        if now - self.last_seen.get(key, -self.interval) < self.interval:
+            self.suppressed += 1
+            return False
+        self.last_seen[key] = now
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock handler formats the message in the calling thread; leave
+    # that to the listener so the game loop only pays for the enqueue.
+    def prepare(self, record):
+        return record
+
+
+def parse_levels(spec):
+    """Parses "pose=DEBUG,game=INFO" into a {subsystem: level} dict."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        subsystem, _, level = item.rpartition("=")
+        levels[subsystem or ROOT] = level.upper()
+    return levels
+
+
+def configure(levels=None, sample_rate=5.0, capacity=1024, stream=None, level="INFO"):
+    """Routes all game logging through a ring buffer and a writer thread.
+
+    ``levels`` maps subsystems to level names and is merged over the
+    MARIO_LOG environment variable (same syntax as parse_levels); ``level``
+    applies to subsystems not listed. Calling it again reconfigures.
+    """
+    global _listener
+    shutdown()
+
+    merged = parse_levels(os.environ.get("MARIO_LOG", ""))
+    merged.update(levels or {})
+    root = logging.getLogger(ROOT)
+    root.setLevel(merged.pop(ROOT, level))
+    for subsystem, subsystem_level in merged.items():
+        getLogger(subsystem).setLevel(subsystem_level)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+    handler = _DeferredQueueHandler(RingQueue(capacity))
+    handler.addFilter(SamplingFilter(sample_rate))
+    root.handlers = [handler]
+    root.propagate = False
+
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
+    return root
+
+
+def shutdown():
+    """Flushes the ring buffer and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
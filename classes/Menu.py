@@ -21,6 +21,8 @@ class Menu:
         self.inChoosingLevel = False
         self.dashboard = dashboard
         self.levelCount = 0
+        # Set whenever the screen needs to be presented again.
+        self.dirty = True
         self.spritesheet = Spritesheet("./img/title_screen.png")
         self.menu_banner = self.spritesheet.image_at(
             0,
@@ -40,17 +42,26 @@ class Menu:
         self.loadSettings("./settings.json")
 
     def update(self):
+        """Redraws the menu if anything changed; returns True if it did.
+
+        The level chooser draws itself as it changes, so for it this only
+        reports that the screen needs presenting.
+        """
         self.checkInput()
+        if not self.dirty:
+            return False
+        self.dirty = False
         if self.inChoosingLevel:
-            return
+            return True
 
         self.drawMenuBackground()
-        self.dashboard.update()
+        self.dashboard.draw()
 
         if not self.inSettings:
             self.drawMenu()
         else:
             self.drawSettings()
+        return True
 
     def drawDot(self):
         if self.state == 0:
@@ -161,6 +172,7 @@ class Menu:
         pygame.draw.rect(self.screen, color, (x+width, y, thickness, width+thickness))
 
     def drawLevelChooser(self):
+        self.dirty = True
         j = 0
         offset = 75
         textOffset = 90
@@ -195,6 +207,7 @@ class Menu:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
+                self.dirty = True
                 if event.key == pygame.K_ESCAPE:
                     if self.inChoosingLevel or self.inSettings:
                         self.inChoosingLevel = False
@@ -262,4 +275,3 @@ class Menu:
                             self.saveSettings("./settings.json")
                         elif self.state == 2:
                             self.inSettings = False
-        pygame.display.update()
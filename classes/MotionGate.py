@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decides whether a frame differs enough from the last inferred one.
+
+    Frames are shrunk to a tiny grayscale image and compared with the one
+    the model last ran on; while no cell differs by ``threshold`` grey levels
+    or more the previous result can be reused. Taking the largest cell
+    difference rather than the mean means one raised finger, which covers a
+    cell or two, counts as motion. Each cell averages a patch of pixels, so
+    sensor noise stays well under the threshold. A result is never reused
+    for longer than ``max_age`` seconds.
+    """
+
+    def __init__(self, size=(32, 24), threshold=8.0, max_age=0.5):
+        self.size = size
+        self.threshold = threshold
+        self.max_age = max_age
+        self.small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self.current = np.empty((size[1], size[0]), dtype=np.uint8)
+        self.reference = np.empty_like(self.current)
+        self.difference = np.empty_like(self.current)
+        self.reference_time = None
+        self.checked = 0
+        self.skipped = 0
+
+    def is_static(self, frame, timestamp):
+        """True if ``frame`` may reuse the result of the last inferred frame."""
+        self.checked += 1
+        cv2.resize(frame, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.current)
+        if self.reference_time is None or timestamp - self.reference_time > self.max_age:
+            return False
+        cv2.absdiff(self.current, self.reference, dst=self.difference)
+        if cv2.minMaxLoc(self.difference)[1] >= self.threshold:
+            return False
+        self.skipped += 1
+        return True
+
+    def accept(self, timestamp):
+        """Marks the frame last checked as the one inference ran on."""
+        self.current, self.reference = self.reference, self.current
+        self.reference_time = timestamp
+
+    def reset(self):
+        self.reference_time = None
+
+    def stats(self):
+        return {"checked": self.checked, "skipped": self.skipped}
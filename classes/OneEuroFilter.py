@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter over a whole landmark array at once.
+
+    Every coordinate gets its own adaptive cutoff, ``min_cutoff + beta *
+    |speed|`` in Hz: a landmark at rest is smoothed hard, which removes
+    jitter, while a moving one is barely filtered, so fast gestures keep
+    their timing. The speed itself is low-passed at ``d_cutoff`` Hz.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.speed = None
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, points, timestamp):
+        """Smooths ``points`` taken at ``timestamp``; returns a new array."""
+        points = np.asarray(points, dtype=np.float32)
+        if self.value is None or self.value.shape != points.shape:
+            self.value = points.copy()
+            self.speed = np.zeros_like(points)
+            self.timestamp = timestamp
+            return self.value.copy()
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value.copy()
+        self.timestamp = timestamp
+
+        speed = (points - self.value) / dt
+        self.speed += self._alpha(self.d_cutoff, dt) * (speed - self.speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.speed)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+        self.value += alpha * (points - self.value)
+        return self.value.copy()
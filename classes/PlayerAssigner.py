@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class PlayerAssigner:
+    """Gives every detected hand a stable player ID.
+
+    Hands are matched to the players seen before by wrist position, with a
+    penalty when the reported handedness changes. A player keeps their slot
+    for ``timeout`` seconds after their hand disappears; new hands fill free
+    slots from left to right across the image.
+    """
+
+    def __init__(self, players, handedness_penalty=0.3, max_distance=0.35, timeout=1.0):
+        self.players = players
+        self.handedness_penalty = handedness_penalty
+        self.max_distance = max_distance
+        self.timeout = timeout
+        self.positions = [None] * players
+        self.handedness = [None] * players
+        self.seen_at = [None] * players
+
+    def assign(self, hands, timestamp):
+        """Maps (points, handedness) hands to a per-player list.
+
+        Players without a hand this frame get (None, None).
+        """
+        for player in range(self.players):
+            if self.seen_at[player] is not None and timestamp - self.seen_at[player] > self.timeout:
+                self.positions[player] = self.handedness[player] = self.seen_at[player] = None
+
+        wrists = [points[0, :2] for points, _ in hands]
+        pairs = []
+        for hand, (wrist, (_, handedness)) in enumerate(zip(wrists, hands)):
+            for player in range(self.players):
+                if self.positions[player] is None:
+                    continue
+                cost = float(np.linalg.norm(wrist - self.positions[player]))
+                if cost > self.max_distance:
+                    continue
+                if handedness != self.handedness[player]:
+                    cost += self.handedness_penalty
+                pairs.append((cost, hand, player))
+
+        assigned = [None] * self.players
+        taken = set()
+        for cost, hand, player in sorted(pairs):
+            if assigned[player] is None and hand not in taken:
+                assigned[player] = hand
+                taken.add(hand)
+
+        free = [player for player in range(self.players) if assigned[player] is None and self.positions[player] is None]
+        newcomers = sorted((hand for hand in range(len(hands)) if hand not in taken), key=lambda hand: wrists[hand][0])
+        for player, hand in zip(free, newcomers):
+            assigned[player] = hand
+
+        result = []
+        for player, hand in enumerate(assigned):
+            if hand is None:
+                result.append((None, None))
+                continue
+            self.positions[player] = wrists[hand]
+            self.handedness[player] = hands[hand][1]
+            self.seen_at[player] = timestamp
+            result.append(hands[hand])
+        return result
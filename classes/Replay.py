@@ -0,0 +1,88 @@
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"GCMREPLY"
+VERSION = 1
+# magic, version, level RNG seed, player count, level name
+HEADER = struct.Struct("<8sIQI32s")
+
+
+def record_dtype(players):
+    """One record per simulation tick: the state hash after the tick and
+    the action code every player applied before it."""
+    return np.dtype([("hash", "<u4"), ("actions", "u1", (players,))])
+
+
+def state_hash(level, marios):
+    """CRC32 of everything the simulation evolves, for comparing runs.
+
+    Covers every Mario, every entity and the dashboard counters. Floats go
+    through repr, which is exact, so any bit of divergence changes the hash.
+    """
+    state = [level.dashboard.points, level.dashboard.coins]
+    for mario in marios:
+        state.append((
+            mario.rect.x, mario.rect.y, mario.rect.w, mario.rect.h, mario.vel.x, mario.vel.y,
+            mario.powerUpState, mario.invincibilityFrames, mario.inAir, mario.inJump, mario.onGround,
+        ))
+    for entity in level.entityList:
+        vel = entity.vel
+        state.append((
+            type(entity).__name__, entity.rect.x, entity.rect.y, getattr(vel, "x", vel), getattr(vel, "y", 0),
+            entity.alive, entity.active, entity.bouncing, entity.timer,
+        ))
+    return zlib.crc32(repr(state).encode())
+
+
+class ReplayWriter:
+    """Records the per-tick actions and state hashes of one run.
+
+    With the level name and RNG seed in the header this is all it takes to
+    re-run the game tick for tick, at five bytes a tick for one player.
+    """
+
+    def __init__(self, path, levelName, seed, players=1, block_size=1024):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, players, levelName.encode()))
+        self.block = np.zeros(block_size, dtype=record_dtype(players))
+        self.count = 0
+
+    def write(self, actions, stateHash):
+        record = self.block[self.count]
+        record["hash"] = stateHash
+        record["actions"] = actions
+        self.count += 1
+        if self.count == len(self.block):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.block[:self.count].tofile(self.file)
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class Replay:
+    """A recorded run: level, seed, per-tick actions and state hashes."""
+
+    def __init__(self, path):
+        with open(path, "rb") as replayFile:
+            magic, version, self.seed, self.players, levelName = HEADER.unpack(replayFile.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("Not a replay file: {}".format(path))
+            if version != VERSION:
+                raise ValueError("Unsupported replay version {} in {}".format(version, path))
+            self.records = np.fromfile(replayFile, dtype=record_dtype(self.players))
+        self.levelName = levelName.rstrip(b"\0").decode()
+        self.actions = self.records["actions"]
+        self.hashes = self.records["hash"]
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class RoiTracker:
+    """Crops inference input to the area around the last detected hand.
+
+    The region is the previous frame's landmark bounding box grown by a
+    margin and squared up, so the model sees far fewer pixels while the hand
+    stays in view. When no hand was found the next frame is searched in full.
+
+    The hand model tracks the hand from frame to frame in the coordinates of
+    the image it is given, so the region is held still while the hand stays
+    well inside it (at least ``slack`` of the region from every edge) and
+    does not shrink below ``shrink`` of the size it was fitted to. It is
+    only refitted when the hand nears an edge or its size changes a lot.
+    """
+
+    def __init__(self, margin=0.35, min_size=0.2, slack=0.1, shrink=0.6):
+        self.margin = margin
+        self.min_size = min_size
+        self.slack = slack
+        self.shrink = shrink
+        self.box = None
+        self.refits = 0
+
+    def crop(self, image):
+        """Returns the image to run inference on and its (x, y, w, h) region."""
+        height, width = image.shape[:2]
+        if self.box is None:
+            return image, None
+        x0, y0, x1, y1 = self.box
+        left, right = int(x0 * width), int(np.ceil(x1 * width))
+        top, bottom = int(y0 * height), int(np.ceil(y1 * height))
+        return image[top:bottom, left:right], (left, top, right - left, bottom - top)
+
+    def to_full(self, points, region, shape):
+        """Maps landmarks normalised to the crop back to the full frame."""
+        if region is None:
+            return points
+        height, width = shape[:2]
+        left, top, crop_width, crop_height = region
+        full = np.empty_like(points)
+        full[:, 0] = (points[:, 0] * crop_width + left) / width
+        full[:, 1] = (points[:, 1] * crop_height + top) / height
+        full[:, 2] = points[:, 2] * crop_width / width
+        return full
+
+    def update(self, points, shape):
+        """Keeps or refits the next crop around ``points``; drops it if the hand is lost."""
+        if points is None:
+            self.box = None
+            return
+        height, width = shape[:2]
+        x0, y0 = points[:, :2].min(axis=0)
+        x1, y1 = points[:, :2].max(axis=0)
+        # Square in pixels, so the model sees the hand undistorted.
+        size = max((x1 - x0) * width, (y1 - y0) * height) * (1 + 2 * self.margin)
+        size = max(size, self.min_size * min(width, height))
+        if self.box is not None and self._holds(x0, y0, x1, y1, size, width, height):
+            return
+        self.refits += 1
+        half_w, half_h = size / 2 / width, size / 2 / height
+        cx, cy = float(x0 + x1) / 2, float(y0 + y1) / 2
+        box = (max(cx - half_w, 0.0), max(cy - half_h, 0.0), min(cx + half_w, 1.0), min(cy + half_h, 1.0))
+        if box[2] - box[0] <= 0 or box[3] - box[1] <= 0:
+            self.box = None
+        else:
+            self.box = box
+
+    def _holds(self, x0, y0, x1, y1, size, width, height):
+        """True if the current box still fits a hand with this bounding box."""
+        bx0, by0, bx1, by1 = self.box
+        box_size = max((bx1 - bx0) * width, (by1 - by0) * height)
+        if size < self.shrink * box_size:
+            return False
+        # Edges clipped to the frame have nowhere further to go.
+        inset_x, inset_y = self.slack * (bx1 - bx0), self.slack * (by1 - by0)
+        return (
+            (x0 >= bx0 + inset_x or bx0 == 0.0)
+            and (y0 >= by0 + inset_y or by0 == 0.0)
+            and (x1 <= bx1 - inset_x or bx1 == 1.0)
+            and (y1 <= by1 - inset_y or by1 == 1.0)
+        )
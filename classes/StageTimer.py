@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class StageTimer:
+    """Rolling per-stage timing histograms.
+
+    Keeps the last ``window`` samples of every named stage, so the
+    percentiles follow the current behaviour rather than the whole session.
+    Samples may be recorded from any thread.
+    """
+
+    def __init__(self, window=300):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self.lock:
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+    def stats(self):
+        """p50/p95/p99, last sample and sample count per stage, in ms."""
+        with self.lock:
+            snapshot = {stage: np.array(samples) * 1000.0 for stage, samples in self.samples.items()}
+        stats = {}
+        for stage, samples in snapshot.items():
+            if not len(samples):
+                continue
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            stats[stage] = {
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "last": float(samples[-1]),
+                "count": len(samples),
+            }
+        return stats
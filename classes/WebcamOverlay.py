@@ -0,0 +1,34 @@
+import cv2
+import numpy as np
+import pygame
+
+
+class WebcamOverlay:
+    def __init__(self, screen, pos=(10, 10), size=(160, 120)):
+        self.screen = screen
+        self.pos = pos
+        self.size = size
+        self.surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.thumbnail = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self.source = None
+
+    def update(self, frame):
+        """Blits the thumbnail; returns its rect if it shows a new frame."""
+        # Only a new camera frame is resized into the cached surface; on
+        # every other render frame the cached surface is simply blitted.
+        changed = None
+        if frame is not None and frame is not self.source:
+            self.source = frame
+            if frame.shape[:2] == self.thumbnail.shape[:2]:
+                thumbnail = frame
+            else:
+                thumbnail = cv2.resize(frame, self.size, dst=self.thumbnail, interpolation=cv2.INTER_AREA)
+            pixels = pygame.surfarray.pixels3d(self.surface)
+            pixels[...] = thumbnail.swapaxes(0, 1)[..., ::-1]
+            del pixels
+            changed = pygame.Rect(self.pos, self.size)
+        if self.source is not None:
+            self.screen.blit(self.surface, self.pos)
+        return changed
@@ -11,6 +11,7 @@ setup(
         ("sprites", glob.glob("sprites\\*.json")),
         ("sfx", glob.glob("sfx\\*.ogg") + glob.glob("sfx\\*.wav")),
         ("levels", glob.glob("levels\\*.json")),
+        ("gestures", glob.glob("gestures\\*.json")),
         ("img", glob.glob("img\\*.gif") + glob.glob("img\\*.png")),
         ("", ["settings.json"]),
     ],
@@ -11,7 +11,10 @@ class Coin(EntityBase):
         self.animation = copy(self.spriteCollection.get("coin").animation)
         self.type = "Item"
 
-    def update(self, cam):
+    def step(self):
         if self.alive:
             self.animation.update()
+
+    def draw(self, cam):
+        if self.alive:
             self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y))
@@ -19,12 +19,12 @@ class CoinBox(EntityBase):
         self.vel = 1
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
-    def update(self, cam):
+    def step(self):
         if self.alive and not self.triggered:
             self.animation.update()
         else:
             self.animation.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
+            self.item.spawnCoin(self.sound, self.dashboard)
             if self.time < self.maxTime:
                 self.time += 1
                 self.rect.y -= self.vel
@@ -32,6 +32,10 @@ class CoinBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
+
+    def draw(self, cam):
+        if not self.alive or self.triggered:
+            self.item.drawCoin(cam)
         self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
@@ -16,10 +16,14 @@ class CoinBrick(EntityBase):
         self.dashboard = dashboard
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
-    def update(self, cam):
+    def step(self):
         if not self.alive or self.triggered:
             self.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
+            self.item.spawnCoin(self.sound, self.dashboard)
+
+    def draw(self, cam):
+        if not self.alive or self.triggered:
+            self.item.drawCoin(cam)
         self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
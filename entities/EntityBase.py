@@ -7,6 +7,8 @@ class EntityBase(object):
     def __init__(self, x, y, gravity):
         self.vel = Vec2D()
         self.rect = pygame.Rect(x * 32, y * 32, 32, 32)
+        # Position before the last simulation tick, for interpolated drawing.
+        self.lastX, self.lastY = self.rect.x, self.rect.y
         self.gravity = gravity
         self.traits = None
         self.alive = True
@@ -22,13 +24,32 @@ class EntityBase(object):
         if self.obeyGravity:
             self.vel.y += self.gravity
 
-    def updateTraits(self):
+    def stepTraits(self):
         for trait in self.traits.values():
             try:
-                trait.update()
+                trait.step()
             except AttributeError:
                 pass
 
+    def step(self):
+        pass
+
+    def draw(self, camera):
+        pass
+
+    def drawInterpolated(self, camera, alpha=1.0):
+        """Draws the entity ``alpha`` of the way from the last tick to this one."""
+        if alpha >= 1.0:
+            self.draw(camera)
+            return
+        x, y = self.rect.x, self.rect.y
+        self.rect.x = round(self.lastX + (x - self.lastX) * alpha)
+        self.rect.y = round(self.lastY + (y - self.lastY) * alpha)
+        try:
+            self.draw(camera)
+        finally:
+            self.rect.x, self.rect.y = x, y
+
     def getPosIndex(self):
         return Vec2D(self.rect.x // 32, self.rect.y // 32)
 
@@ -26,25 +26,32 @@ class Goomba(EntityBase):
         self.sound = sound
         self.textPos = Vec2D(0, 0)
 
-    def update(self, camera):
+    def step(self):
         if self.alive:
             self.applyGravity()
-            self.drawGoomba(camera)
-            self.leftrightTrait.update()
+            self.animation.update()
+            self.leftrightTrait.step()
             self.checkEntityCollision()
         else:
-            self.onDead(camera)
+            self.onDead()
+
+    def draw(self, camera):
+        if self.alive:
+            self.drawGoomba(camera)
+        else:
+            if self.timer > 0:
+                # Stomped this tick: onDead() places the text on the next one.
+                self.drawPointsText(camera)
+            self.drawFlatGoomba(camera)
 
     def drawGoomba(self, camera):
         self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y))
-        self.animation.update()
 
-    def onDead(self, camera):
+    def onDead(self):
         if self.timer == 0:
             self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
         if self.timer < self.timeAfterDeath:
-            self.movePointsTextUpAndDraw(camera)
-            self.drawFlatGoomba(camera)
+            self.movePointsTextUp()
         else:
             self.alive = None
         self.timer += 0.1
@@ -58,8 +65,10 @@ class Goomba(EntityBase):
     def setPointsTextStartPosition(self, x, y):
         self.textPos = Vec2D(x, y)
 
-    def movePointsTextUpAndDraw(self, camera):
+    def movePointsTextUp(self):
         self.textPos.y += -0.5
+
+    def drawPointsText(self, camera):
         self.dashboard.drawText("100", self.textPos.x + camera.x, self.textPos.y, 8)
     
     def checkEntityCollision(self):
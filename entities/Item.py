@@ -13,7 +13,7 @@ class Item(Dashboard):
         self.coin_animation = copy(collection.get("coin-item").animation)
         self.sound_played = False
 
-    def spawnCoin(self, cam, sound, dashboard):
+    def spawnCoin(self, sound, dashboard):
         if not self.sound_played:
             self.sound_played = True
             dashboard.points += 100
@@ -26,10 +26,14 @@ class Item(Dashboard):
             elif self.coin_animation.timer < 45:
                 self.itemVel.y += 0.5
                 self.ItemPos.y += self.itemVel.y
+        elif self.coin_animation.timer < 80:
+            self.itemVel.y = -0.75
+            self.ItemPos.y += self.itemVel.y
+
+    def drawCoin(self, cam):
+        if self.coin_animation.timer < 45:
             self.screen.blit(
                 self.coin_animation.image, (self.ItemPos.x + cam.x, self.ItemPos.y)
             )
         elif self.coin_animation.timer < 80:
-            self.itemVel.y = -0.75
-            self.ItemPos.y += self.itemVel.y
             self.drawText("100", self.ItemPos.x + 3 + cam.x, self.ItemPos.y, 8)
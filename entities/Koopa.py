@@ -29,15 +29,26 @@ class Koopa(EntityBase):
         self.levelObj = level
         self.sound = sound
 
-    def update(self, camera):
+    def step(self):
         if self.alive and self.active:
-            self.updateAlive(camera)
+            self.updateAlive()
             self.checkEntityCollision()
         elif self.alive and not self.active and not self.bouncing:
-            self.sleepingInShell(camera)
+            self.sleepingInShell()
             self.checkEntityCollision()
         elif self.bouncing:
-            self.shellBouncing(camera)
+            self.shellBouncing()
+
+    def draw(self, camera):
+        if self.alive and self.active:
+            self.drawKoopa(camera)
+        elif self.alive and not self.active and not self.bouncing:
+            self.screen.blit(
+                self.spriteCollection.get("koopa-hiding").image,
+                (self.rect.x + camera.x, self.rect.y - 32),
+            )
+        elif self.bouncing:
+            self.drawKoopa(camera)
 
     def drawKoopa(self, camera):
         if self.leftrightTrait.direction == -1:
@@ -50,31 +61,24 @@ class Koopa(EntityBase):
                 (self.rect.x + camera.x, self.rect.y - 32),
             )
 
-    def shellBouncing(self, camera):
+    def shellBouncing(self):
         self.leftrightTrait.speed = 4
         self.applyGravity()
         self.animation.image = self.spriteCollection.get("koopa-hiding").image
-        self.drawKoopa(camera)
-        self.leftrightTrait.update()
+        self.leftrightTrait.step()
 
-    def sleepingInShell(self, camera):
-        if self.timer < self.timeAfterDeath:
-            self.screen.blit(
-                self.spriteCollection.get("koopa-hiding").image,
-                (self.rect.x + camera.x, self.rect.y - 32),
-            )
-        else:
+    def sleepingInShell(self):
+        if self.timer >= self.timeAfterDeath:
             self.alive = True
             self.active = True
             self.bouncing = False
             self.timer = 0
         self.timer += 0.1
 
-    def updateAlive(self, camera):
+    def updateAlive(self):
         self.applyGravity()
-        self.drawKoopa(camera)
         self.animation.update()
-        self.leftrightTrait.update()
+        self.leftrightTrait.step()
 
     def checkEntityCollision(self):
         for ent in self.levelObj.entityList:
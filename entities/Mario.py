@@ -1,3 +1,5 @@
+from copy import copy
+
 import pygame
 
 from classes.Animation import Animation
@@ -35,18 +37,22 @@ bigAnimation = Animation(
 
 
 class Mario(EntityBase):
-    def __init__(self, x, y, level, screen, dashboard, sound, gravity=0.8):
+    def __init__(self, x, y, level, screen, dashboard, sound, gravity=0.8, camera=None):
         super(Mario, self).__init__(x, y, gravity)
-        self.camera = Camera(self.rect, self)
+        # Extra players share the first player's camera.
+        self.camera = camera if camera is not None else Camera(self.rect, self)
         self.sound = sound
         self.input = Input(self)
         self.inAir = False
         self.inJump = False
         self.powerUpState = 0
         self.invincibilityFrames = 0
+        # Own copies, so several Marios do not advance each other's frames.
+        self.smallAnimation = copy(smallAnimation)
+        self.bigAnimation = copy(bigAnimation)
         self.traits = {
             "jumpTrait": JumpTrait(self),
-            "goTrait": GoTrait(smallAnimation, screen, self.camera, self),
+            "goTrait": GoTrait(self.smallAnimation, screen, self.camera, self),
             "bounceTrait": bounceTrait(self),
         }
 
@@ -56,19 +62,57 @@ class Mario(EntityBase):
         self.EntityCollider = EntityCollider(self)
         self.dashboard = dashboard
         self.restart = False
+        # Radius of the closing death circle while the death animation runs.
+        self.dying = False
+        self.deathRadius = 0
+        self.deathOverlay = None
         self.pause = False
         self.pauseObj = Pause(screen, self, dashboard)
-
-    def update(self):
+        self.lastX, self.lastY = self.rect.x, self.rect.y
+
+    def step(self):
+        self.lastX, self.lastY = self.rect.x, self.rect.y
+        if self.dying:
+            # Mario stays put while the circle closes, then the level restarts.
+            self.deathRadius -= 2
+            if self.deathRadius <= 20:
+                self.restart = True
+            self.input.checkForInput()
+            return
         if self.invincibilityFrames > 0:
             self.invincibilityFrames -= 1
-        self.updateTraits()
+        self.stepTraits()
         self.moveMario()
-        self.camera.move()
+        # A shared camera follows only the Mario that owns it.
+        if self.camera.entity is self:
+            self.camera.move()
         self.applyGravity()
         self.checkEntityCollision()
         self.input.checkForInput()
 
+    def draw(self, camera, alpha=1.0):
+        """Draws Mario ``alpha`` of the way from the last tick to this one."""
+        if (self.invincibilityFrames // 2) % 2 == 0:
+            x = self.lastX + (self.rect.x - self.lastX) * alpha
+            y = self.lastY + (self.rect.y - self.lastY) * alpha
+            self.traits["goTrait"].draw((camera.x + x, y))
+        if self.dying:
+            self.drawDeath(camera)
+
+    def drawDeath(self, camera):
+        """Blacks out the screen except for a circle closing in on Mario."""
+        if self.deathOverlay is None:
+            self.deathOverlay = pygame.Surface(self.screen.get_size())
+            self.deathOverlay.set_colorkey((255, 255, 255), pygame.RLEACCEL)
+        self.deathOverlay.fill((0, 0, 0))
+        pygame.draw.circle(
+            self.deathOverlay,
+            (255, 255, 255),
+            (int(camera.x + self.rect.x) + 16, self.rect.y + 16),
+            self.deathRadius,
+        )
+        self.screen.blit(self.deathOverlay, (0, 0))
+
     def moveMario(self):
         self.rect.y += self.vel.y
         self.collision.checkY()
@@ -129,7 +173,7 @@ class Mario(EntityBase):
                 self.gameOver()
             elif self.powerUpState == 1:
                 self.powerUpState = 0
-                self.traits['goTrait'].updateAnimation(smallAnimation)
+                self.traits['goTrait'].updateAnimation(self.smallAnimation)
                 x, y = self.rect.x, self.rect.y
                 self.rect = pygame.Rect(x, y + 32, 32, 32)
                 self.invincibilityFrames = 60
@@ -150,27 +194,13 @@ class Mario(EntityBase):
         self.dashboard.points += 100
 
     def gameOver(self):
-        srf = pygame.Surface((640, 480))
-        srf.set_colorkey((255, 255, 255), pygame.RLEACCEL)
-        srf.set_alpha(128)
+        """Starts the death animation; step() and draw() play it out."""
+        if self.dying:
+            return
         self.sound.music_channel.stop()
         self.sound.music_channel.play(self.sound.death)
-
-        for i in range(500, 20, -2):
-            srf.fill((0, 0, 0))
-            pygame.draw.circle(
-                srf,
-                (255, 255, 255),
-                (int(self.camera.x + self.rect.x) + 16, self.rect.y + 16),
-                i,
-            )
-            self.screen.blit(srf, (0, 0))
-            pygame.display.update()
-            self.input.checkForInput()
-        while self.sound.music_channel.get_busy():
-            pygame.display.update()
-            self.input.checkForInput()
-        self.restart = True
+        self.dying = True
+        self.deathRadius = 500
 
     def getPos(self):
         return self.camera.x + self.rect.x, self.rect.y
@@ -183,6 +213,6 @@ class Mario(EntityBase):
         if self.powerUpState == 0:
             if powerupID == 1:
                 self.powerUpState = 1
-                self.traits['goTrait'].updateAnimation(bigAnimation)
+                self.traits['goTrait'].updateAnimation(self.bigAnimation)
                 self.rect = pygame.Rect(self.rect.x, self.rect.y-32, 32, 64)
                 self.invincibilityFrames = 20
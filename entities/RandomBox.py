@@ -19,7 +19,7 @@ class RandomBox(EntityBase):
         self.item = item
         self.level = level
 
-    def update(self, cam):
+    def step(self):
         if self.alive and not self.triggered:
             self.animation.update()
         else:
@@ -35,6 +35,8 @@ class RandomBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
+
+    def draw(self, cam):
         self.screen.blit(
             self.spriteCollection.get("sky").image,
             (self.rect.x + cam.x, self.rect.y + 2),
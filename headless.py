@@ -0,0 +1,230 @@
+"""Runs the game simulation without a window, camera or sound card.
+
+Mario is driven by a scripted or recorded action stream and the fixed
+simulation tick runs as fast as the CPU allows:
+
+    python headless.py                              # built-in script, Level1-1
+    python headless.py --level Level1-2 --ticks 100000
+    python headless.py --script run.txt --draw      # also time drawing
+    python headless.py --trace sessions/run1.trace  # replay recorded gestures
+    python headless.py --record run.replay --seed 7
+    python headless.py --replay run.replay          # verify tick for tick
+
+A script file has one "<ticks> <action>" pair per line, e.g. "90 right",
+and loops. A trace replays the raw game-mode gestures of a landmark trace
+through the game's debouncer, one tick per 1 / TICKS_PER_SECOND of
+recorded time. Reports ticks per second for simulation and drawing.
+
+--record saves the run's per-tick actions and state hashes; --replay runs a
+recording (from here or from main.py) again with the same level and seed
+and reports the first tick whose state hash differs. A recorded run ends
+at the first death.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+# Must be set before pygame initialises its drivers.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from classes.Action import Action
+from classes.Dashboard import Dashboard
+from classes.FixedTimestep import TICKS_PER_SECOND
+from classes.GestureDebouncer import GestureDebouncer
+from classes.GestureTable import GestureTable
+from classes.LandmarkTrace import MODES, LandmarkTrace
+from classes.Level import Level
+from classes.Replay import Replay, ReplayWriter, state_hash
+from classes.Sound import Sound
+from entities.Mario import Mario
+
+windowSize = 640, 480
+
+DEFAULT_SCRIPT = [
+    (90, Action.RIGHT),
+    (10, Action.JUMP),
+    (40, Action.RIGHT),
+    (60, Action.BOOST),
+    (10, Action.JUMP),
+    (20, Action.IDLE),
+]
+
+
+def load_script(path):
+    script = []
+    with open(path) as scriptFile:
+        for line in scriptFile:
+            line = line.split("#")[0].strip()
+            if line:
+                ticks, label = line.split()
+                script.append((int(ticks), Action.from_label(label)))
+    return script
+
+
+def scripted_actions(script):
+    """Endless per-tick actions from a list of (ticks, action) pairs."""
+    for ticks, action in itertools.cycle(script):
+        for _ in range(ticks):
+            yield action
+
+
+def recorded_actions(path):
+    """Per-tick confirmed actions from the game-mode records of a trace."""
+    trace = LandmarkTrace(path)
+    game = trace.modes == MODES.index("game")
+    timestamps, actions = trace.timestamps[game], trace.actions[game]
+    if not len(timestamps):
+        return
+    debouncer = GestureDebouncer(idle=Action.IDLE, **GestureTable.load("./gestures/game.json").debounce)
+    start, index = timestamps[0], 0
+    for tick in itertools.count():
+        now = start + tick / TICKS_PER_SECOND
+        while index < len(timestamps) and timestamps[index] <= now:
+            debouncer.update(Action(actions[index]), timestamps[index])
+            index += 1
+        if index == len(timestamps):
+            return
+        yield debouncer.confirmed
+
+
+class Game:
+    """One level and its Marios, rebuilt from the same seed after a death."""
+
+    def __init__(self, screen, levelName, seed=None, players=1):
+        self.screen = screen
+        self.levelName = levelName
+        self.seed = seed
+        self.players = players
+        self.dashboard = Dashboard("./img/font.png", 8, screen)
+        self.sound = Sound()
+        self.sound.allowSFX = False
+        self.restart()
+
+    def restart(self):
+        self.level = Level(self.screen, self.sound, self.dashboard, self.seed)
+        self.seed = self.level.seed
+        self.level.loadLevel(self.levelName)
+        self.mario = Mario(0, 0, self.level, self.screen, self.dashboard, self.sound)
+        self.marios = [self.mario] + [
+            Mario(player, 0, self.level, self.screen, self.dashboard, self.sound, camera=self.mario.camera)
+            for player in range(1, self.players)
+        ]
+
+    @property
+    def dead(self):
+        return any(mario.restart for mario in self.marios)
+
+    def step(self, actions):
+        for mario, action in zip(self.marios, actions):
+            mario.input.applyAction(action)
+        self.level.step()
+        self.dashboard.step()
+        for mario in self.marios:
+            mario.step()
+
+    def stateHash(self):
+        return state_hash(self.level, self.marios)
+
+    def draw(self):
+        self.level.draw(self.mario.camera)
+        self.dashboard.draw()
+        for mario in self.marios:
+            mario.draw(self.mario.camera)
+
+
+def run(game, actions, ticks, draw=False, record=None, expected=None):
+    """Steps ``game`` through per-tick action lists and times it.
+
+    ``record`` is a ReplayWriter to save the run to; ``expected`` holds the
+    state hashes of a recording, and the run stops at the first mismatch.
+    Either one ends the run at the first death.
+    """
+    stats = {"ticks": 0, "deaths": 0, "step": 0.0, "draw": 0.0, "furthest": 0, "diverged": None}
+    hashing = record is not None or expected is not None
+    for tick, tickActions in enumerate(itertools.islice(actions, ticks)):
+        started = time.perf_counter()
+        game.step(tickActions)
+        elapsed = time.perf_counter() - started
+        stats["ticks"] += 1
+        stats["step"] += elapsed
+        stats["furthest"] = max(stats["furthest"], game.mario.rect.x)
+        if hashing:
+            stateHash = game.stateHash()
+            if record is not None:
+                record.write(tickActions, stateHash)
+            if expected is not None and stateHash != expected[tick]:
+                stats["diverged"] = tick
+                break
+        if game.dead:
+            stats["deaths"] += 1
+            if hashing:
+                break
+            game.restart()
+            continue
+        if draw:
+            started = time.perf_counter()
+            game.draw()
+            stats["draw"] += time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game simulation headless and uncapped.")
+    parser.add_argument("--level", default="Level1-1")
+    parser.add_argument("--ticks", type=int, default=20000)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--script", help="text file of '<ticks> <action>' lines")
+    source.add_argument("--trace", help="landmark trace whose gestures drive Mario")
+    source.add_argument("--replay", help="recorded run to re-run and verify")
+    parser.add_argument("--record", help="save the run's actions and state hashes to this file")
+    parser.add_argument("--seed", type=int, default=None, help="level RNG seed (random if not given)")
+    parser.add_argument("--draw", action="store_true", help="also draw every tick to an off-screen display")
+    args = parser.parse_args()
+
+    levelName, seed, players, expected = args.level, args.seed, 1, None
+    if args.replay:
+        replay = Replay(args.replay)
+        levelName, seed, players, expected = replay.levelName, replay.seed, replay.players, replay.hashes
+        actions = ([Action(code) for code in codes] for codes in replay.actions)
+        args.ticks = len(replay)
+    elif args.trace:
+        actions = ([action] for action in recorded_actions(args.trace))
+    else:
+        script = load_script(args.script) if args.script else DEFAULT_SCRIPT
+        actions = ([action] for action in scripted_actions(script))
+
+    pygame.mixer.pre_init(44100, -16, 2, 4096)
+    pygame.init()
+    screen = pygame.display.set_mode(windowSize)
+    game = Game(screen, levelName, seed, players)
+    record = ReplayWriter(args.record, levelName, game.seed, players) if args.record else None
+    try:
+        stats = run(game, actions, args.ticks, args.draw, record, expected)
+    finally:
+        if record is not None:
+            record.close()
+        pygame.quit()
+
+    ticks = stats["ticks"]
+    print("{} ticks on {} (seed {}), {} deaths, furthest x {}".format(
+        ticks, levelName, game.seed, stats["deaths"], stats["furthest"]))
+    if stats["step"]:
+        print("simulation: {:,.0f} ticks/s ({:.1f}x real time)".format(
+            ticks / stats["step"], ticks / stats["step"] / TICKS_PER_SECOND))
+    if stats["draw"]:
+        print("drawing:    {:,.0f} ticks/s".format(ticks / stats["draw"]))
+    if expected is not None:
+        if stats["diverged"] is not None:
+            print("DIVERGED at tick {} of {}".format(stats["diverged"], len(expected)))
+            return 1
+        print("replay matches all {} ticks".format(len(expected)))
+    return 0 if ticks else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
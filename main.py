@@ -1,16 +1,36 @@
 import pygame
 import time
-import cv2
+from classes import Log
+from classes.Action import Action
 from classes.Dashboard import Dashboard
+from classes.FixedTimestep import FixedTimestep
+from classes.FrameProfiler import FrameProfiler
 from classes.Level import Level
 from classes.Menu import Menu
+from classes.Replay import ReplayWriter, state_hash
 from classes.Sound import Sound
+from classes.WebcamOverlay import WebcamOverlay
 from entities.Mario import Mario
 from pose_control import PoseControl
 
-windowSize = 640, 480
+log = Log.getLogger("game")
 
-def main():
+windowSize = 640, 480
+# Each player is tracked as one hand from the same camera.
+numPlayers = 1
+# Draw positions between simulation ticks, so motion stays smooth when the
+# render rate and the tick rate differ.
+interpolateDrawing = True
+# Seconds between hand searches in the menu while no hand is visible.
+menuIdleInterval = 0.25
+# Record each run's actions and state hashes here, for headless.py --replay.
+replayPath = None
+# Start with the frame profiler overlay shown; F3 toggles it in game.
+showProfiler = False
+# Seconds between updates of the FPS in the window caption.
+captionInterval = 1.0
+
+def main(pose):
     pygame.mixer.pre_init(44100, -16, 2, 4096)
     pygame.init()
     screen = pygame.display.set_mode(windowSize)
@@ -19,96 +39,74 @@ def main():
     sound = Sound()
     level = Level(screen, sound, dashboard)
     menu = Menu(screen, dashboard, level, sound)
+    webcamOverlay = WebcamOverlay(screen)
 
-    pose = PoseControl()
+    # The pose tracker outlives restarts; only its gesture state starts over.
+    pose.reset()
     pose.mode = "menu"
+    # Nobody in front of the camera: look for a hand a few times a second.
+    pose.idle_interval = menuIdleInterval
     clock = pygame.time.Clock()
 
-    gesture_timer = None
-    last_gesture = None
-    confirm_delay = 1.2
-
     # === MENU LOOP WITH GESTURE CONTROL ===
+    # The menu is static, so the screen is only presented when the menu or
+    # the webcam thumbnail changed.
     while not menu.start:
-        action = pose.get_action()
+        pose.get_action()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
 
-        if menu.inChoosingLevel:
-            if action.startswith("menu_"):
-                index = int(action.split("_")[1])
-                if 0 <= index < menu.levelCount:
-                    if menu.currSelectedLevel != index + 1:
+        # Each event is a gesture that was held long enough to be confirmed.
+        for timestamp, action in pose.gestures.pop_events():
+            if menu.start:
+                break
+            index = action.menu_index
+            if menu.inChoosingLevel:
+                if index is not None:
+                    if 0 <= index < menu.levelCount and menu.currSelectedLevel != index + 1:
                         menu.currSelectedLevel = index + 1
                         menu.drawLevelChooser()
-                        pygame.display.update()
-                        gesture_timer = time.time()
-                        last_gesture = action
-
-            if action == "confirm_select":
-                if gesture_timer is None or last_gesture != action:
-                    gesture_timer = time.time()
-                    last_gesture = action
-                elif (time.time() - gesture_timer) >= confirm_delay:
-                    print("[INFO] Level selection confirmed!")
+
+                elif action == Action.CONFIRM_SELECT:
+                    log.info("Level selection confirmed!")
                     menu.inChoosingLevel = False
                     menu.dashboard.state = "start"
                     menu.dashboard.time = 0
                     menu.level.loadLevel(menu.levelNames[menu.currSelectedLevel - 1])
                     menu.dashboard.levelName = menu.levelNames[menu.currSelectedLevel - 1].split("Level")[1]
                     menu.start = True
-                    pose.mode = "game"
-                    time.sleep(1)
-                    gesture_timer = None
-                    last_gesture = None
-            else:
-                if last_gesture == "confirm_select":
-                    gesture_timer = None
-                    last_gesture = None
-
-        elif action.startswith("menu_"):
-            index = int(action.split("_")[1])
-            if index != last_gesture:
-                last_gesture = index
-                gesture_timer = time.time()
-            else:
-                if time.time() - gesture_timer >= confirm_delay:
-                    menu.state = index
-                    menu.update()
-                    pygame.display.update()
-                    print(f"[INFO] Main Menu Gesture Confirmed: Option {index + 1}")
-
-                    if menu.state == 0:
-                        menu.chooseLevel()
-                    elif menu.state == 1:
-                        menu.inSettings = True
-                        menu.state = 0
-                    elif menu.state == 2:
-                        pygame.quit()
-                        exit()
-
-                    time.sleep(1)
-                    gesture_timer = None
-                    last_gesture = None
-        else:
-            if last_gesture is not None and not (isinstance(last_gesture, int) and action.startswith("menu_")) and action != "confirm_select":
-                gesture_timer = None
-                last_gesture = None
-
-        menu.update()
-
-        if pose.last_frame is not None:
-            frame = cv2.resize(pose.last_frame, (160, 120))
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            screen.blit(frame_surface, (10, 10))
-
-        pygame.display.update()
+
+            elif index is not None:
+                menu.state = index
+                menu.dirty = True
+                log.info("Main Menu Gesture Confirmed: Option %d", index + 1)
+
+                if menu.state == 0:
+                    menu.chooseLevel()
+                elif menu.state == 1:
+                    menu.inSettings = True
+                    menu.state = 0
+                elif menu.state == 2:
+                    pygame.quit()
+                    exit()
+
+        redrawn = menu.update()
+        thumbnail = webcamOverlay.update(pose.last_frame)
+
+        if redrawn:
+            pygame.display.update()
+        elif thumbnail is not None:
+            pygame.display.update(thumbnail)
         clock.tick(max_frame_rate)
 
+    # However the menu was left, by gesture or by keyboard, the tracker now
+    # follows the game: game gestures, and a hand search on every frame.
+    pose.mode = "game"
+    pose.idle_interval = None
+
     # === Countdown ===
     print("Starting game in...")
     for i in range(3, 0, -1):
@@ -118,58 +116,99 @@ def main():
 
     # === GAME LOOP ===
     mario = Mario(0, 0, level, screen, dashboard, sound)
-
-    while not mario.restart:
-        pygame.display.set_caption("Super Mario running with {:d} FPS".format(int(clock.get_fps())))
-        action = pose.get_action()
-
-        # Reset movement states
-        mario.traits["goTrait"].direction = 0
-        mario.traits["goTrait"].brake = True
-
-        # === Debug print to confirm gesture and boost state ===
-        print("[DEBUG] Detected action:", action)
-
-        # Set boost flag
-        mario.traits["goTrait"].boost = (action == "boost")
-        print("[DEBUG] Boost flag set to:", mario.traits["goTrait"].boost)
-
-        # Handle jump
-        mario.traits["jumpTrait"].handle_jump(action == "jump")
-
-        # Apply left/right movement
-        if action == "left":
-            mario.traits["goTrait"].direction = -1
-            mario.traits["goTrait"].brake = False
-        elif action == "right":
-            mario.traits["goTrait"].direction = 1
-            mario.traits["goTrait"].brake = False
-
-        if mario.traits["goTrait"].boost:
-            print("Mario Boost Activated!")
+    marios = [mario] + [
+        Mario(player, 0, level, screen, dashboard, sound, camera=mario.camera)
+        for player in range(1, numPlayers)
+    ]
+
+    replay = None
+    if replayPath is not None:
+        replay = ReplayWriter(replayPath, level.levelName, level.seed, numPlayers)
+
+    # The game logic runs in fixed ticks, however fast frames are rendered.
+    timestep = FixedTimestep()
+    profiler = FrameProfiler(visible=showProfiler)
+    # Mario's input handler reads the keyboard events, F3 among them.
+    mario.input.profiler = profiler
+    captionTime = None
+    while not any(player.restart for player in marios):
+        now = time.perf_counter()
+        if captionTime is None or now - captionTime >= captionInterval:
+            pygame.display.set_caption("Super Mario running with {:d} FPS".format(int(clock.get_fps())))
+            captionTime = now
+        profiler.beginFrame()
+        with profiler.measure("gesture"):
+            actions = pose.get_confirmed_actions()
 
         # Game update logic
-        if mario.pause:
-            mario.pauseObj.update()
-        else:
-            level.drawLevel(mario.camera)
-            dashboard.update()
-            mario.update()
-
-        # Webcam overlay
-        if pose.last_frame is not None:
-            frame = cv2.resize(pose.last_frame, (160, 120))
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            screen.blit(frame_surface, (10, 10))
-
-        pygame.display.update()
+        paused = next((player for player in marios if player.pause), None)
+        if paused is not None:
+            paused.pauseObj.update()
+            # Do not catch up on the time spent paused.
+            timestep.reset()
+            profiler.discardFrame()
+            clock.tick(max_frame_rate)
+            continue
+
+        steps = timestep.advance()
+        for step in range(steps):
+            for player, action in zip(marios, actions):
+                player.input.applyAction(action)
+            with profiler.measure("entities"):
+                level.step()
+            with profiler.measure("dashboard"):
+                dashboard.step()
+            with profiler.measure("mario"):
+                for player in marios:
+                    player.step()
+            if replay is not None:
+                replay.write(actions, state_hash(level, marios))
+            if any(player.pause or player.restart for player in marios):
+                break
+
+        # Without interpolation a frame that ran no tick has nothing new to show.
+        if steps or interpolateDrawing:
+            alpha = timestep.alpha if interpolateDrawing else 1.0
+            camera = mario.camera.interpolate(alpha)
+            with profiler.measure("tiles"):
+                level.drawLevel(camera)
+            with profiler.measure("sprites"):
+                level.drawEntities(camera, alpha)
+                for player in marios:
+                    player.draw(camera, alpha)
+            with profiler.measure("dashboard"):
+                dashboard.draw()
+
+            # Webcam overlay
+            with profiler.measure("webcam"):
+                webcamOverlay.update(pose.last_frame)
+            profiler.draw(screen)
+            with profiler.measure("display"):
+                pygame.display.update()
+        profiler.endFrame()
         clock.tick(max_frame_rate)
 
-    pose.release()
+    if replay is not None:
+        replay.close()
+    # After a death the jingle plays out before the level restarts.
+    if any(player.dying for player in marios):
+        while sound.music_channel.get_busy():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+            clock.tick(max_frame_rate)
     return 'restart'
 
 if __name__ == "__main__":
-    exitmessage = 'restart'
-    while exitmessage == 'restart':
-        exitmessage = main()
+    # Levels per subsystem come from MARIO_LOG, e.g. "pose=DEBUG,game=DEBUG".
+    Log.configure()
+    # Opening the camera and loading the hand model take seconds, so
+    # both happen once here rather than on every restart.
+    pose = PoseControl(threaded=True, players=numPlayers, prewarm=True, motion_gate=True)
+    try:
+        exitmessage = 'restart'
+        while exitmessage == 'restart':
+            exitmessage = main(pose)
+    finally:
+        pose.release()
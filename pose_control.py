@@ -1,118 +1,658 @@
+import threading
+import time
+
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from classes import Log
+from classes.Action import Action
+from classes.FrameGrabber import FrameGrabber
+from classes.FrameSource import FrameRecorder, open_source
+from classes.GestureDebouncer import GestureDebouncer
+from classes.GesturePredictor import GesturePredictor
+from classes.GestureTable import GestureTable
+from classes.InferenceGovernor import InferenceGovernor
+from classes.InferenceWorker import InferenceWorker
+from classes.LandmarkTrace import HANDEDNESS, MODES, LandmarkTrace, TraceWriter
+from classes.MotionGate import MotionGate
+from classes.OneEuroFilter import OneEuroFilter
+from classes.PlayerAssigner import PlayerAssigner
+from classes.RoiTracker import RoiTracker
+from classes.StageTimer import StageTimer
+
+HAND_CONNECTIONS = mp.solutions.hands.HAND_CONNECTIONS
+FINGERTIP_INDICES = [4, 8, 12, 16, 20]
+TRACE_EXTENSION = ".trace"
+
+# Landmark indices used by the gesture rules.
+WRIST = 0
+PINKY_MCP = 17
+THUMB_CHAIN = [4, 3, 2]
+FINGER_TIPS = [8, 12, 16, 20]
+FINGER_MCPS = [5, 9, 13, 17]
+FINGER_BITS = 1 << np.arange(5, dtype=np.uint8)
+
+log = Log.getLogger("pose")
+
+# Gesture rules and debounce settings per mode, compiled from gestures/*.json.
+GESTURE_TABLES = {mode: GestureTable.load("./gestures/{}.json".format(mode)) for mode in MODES}
+
+
+def landmarks_to_array(landmarks):
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def extract_features(points):
+    """Computes the gesture feature vector of one hand or a batch of hands.
+
+    ``points`` is a (21, 3) landmark array or an (N, 21, 3) batch of them.
+    The result has shape (..., 5): the thumb ordering test (0 or 1) followed
+    by the index, middle, ring and pinky tip-to-MCP distances normalised by
+    the wrist-to-pinky-MCP base size.
+    """
+    xy = np.asarray(points, dtype=np.float32)[..., :2]
+    base_size = np.linalg.norm(xy[..., WRIST, :] - xy[..., PINKY_MCP, :], axis=-1)
+    base_size = np.where(base_size != 0, base_size, 0.001)
+    ratios = np.linalg.norm(xy[..., FINGER_TIPS, :] - xy[..., FINGER_MCPS, :], axis=-1) / base_size[..., None]
+
+    tip_x, ip_x, mcp_x = np.moveaxis(xy[..., THUMB_CHAIN, 0], -1, 0)
+    pointing_right = xy[..., WRIST, 0] < tip_x
+    thumb = np.where(pointing_right, (tip_x > ip_x) & (ip_x > mcp_x), (tip_x < ip_x) & (ip_x < mcp_x))
+
+    return np.concatenate([thumb[..., None].astype(np.float32), ratios], axis=-1)
+
+
+def extension_flags(features, extension_threshold_factor=0.75):
+    """Turns feature vectors into (thumb, index, middle, ring, pinky) flags."""
+    flags = features > extension_threshold_factor
+    flags[..., 0] = features[..., 0] > 0.5
+    return flags
+
+
+def finger_masks(flags):
+    """Packs (..., 5) extension flags into 5-bit gesture table keys."""
+    return flags.astype(np.uint8) @ FINGER_BITS
+
+
+def classify_landmarks(points, mode, extension_threshold_factor=0.75):
+    """Maps one hand's (21, 3) landmark array to an action for the given mode.
+
+    Returns the Action and the (thumb, index, middle, ring, pinky)
+    extension flags.
+    """
+    flags = extension_flags(extract_features(points), extension_threshold_factor)
+    table = GESTURE_TABLES.get(mode)
+    action = table.lookup(finger_masks(flags)) if table is not None else Action.IDLE
+    return action, tuple(flags.tolist())
+
+
+def classify_batch(points, mode, extension_threshold_factor=0.75):
+    """Classifies an (N, 21, 3) batch of recorded hands into action codes."""
+    flags = extension_flags(extract_features(points), extension_threshold_factor)
+    table = GESTURE_TABLES.get(mode)
+    if table is None:
+        return np.full(flags.shape[:-1], Action.IDLE, dtype=np.uint8)
+    return table.table[finger_masks(flags)]
+
+
+def replay_trace(trace, mode=None, extension_threshold_factor=0.75):
+    """Reclassifies every record of a landmark trace without any inference.
+
+    Each record is classified in the mode it was recorded in unless ``mode``
+    forces one. Returns an array of Action codes, one per record.
+    """
+    if not isinstance(trace, LandmarkTrace):
+        trace = LandmarkTrace(trace)
+    actions = np.full(len(trace), Action.IDLE, dtype=np.uint8)
+    present = trace.hand_present()
+    if mode is not None:
+        groups = [(present, mode)]
+    else:
+        groups = [(present & (trace.modes == code), name) for code, name in enumerate(MODES)]
+    for selected, group_mode in groups:
+        if selected.any():
+            actions[selected] = classify_batch(trace.landmarks[selected], group_mode, extension_threshold_factor)
+    return actions
+
+
 class PoseControl:
-    def __init__(self):
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            print("Error: Could not open webcam.")
-            exit()
-
-        self.hands = mp.solutions.hands.Hands(
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.6
-        )
-        self.drawing = mp.solutions.drawing_utils
-        self.prev_action = "idle"
+    def __init__(self, source=0, threaded=False, use_process=False, record=None, trace=None, roi=False,
+                 latency_budget=None, overlay_size=(160, 120), players=1, predict=False,
+                 smoothing=None, prewarm=False, motion_gate=False, source_options=None):
+        # source: a webcam index, a video file, a directory of frames, a
+        # FrameSource or a landmark trace; record: optional path the live
+        # session is saved to; trace: optional landmark trace output path;
+        # roi: crop inference input to the area around the tracked hand;
+        # latency_budget: per-frame inference budget in ms, which turns on
+        # the quality governor; overlay_size: size of the annotated preview
+        # in last_frame, or None to skip the preview entirely; players: hands
+        # tracked in one inference pass, each driving its own action stream;
+        # predict: feed the debouncers the action a finger transition is
+        # heading for before the classifier reports it; smoothing: None, or
+        # a dict of OneEuroFilter settings (min_cutoff, beta, d_cutoff) to
+        # filter landmark jitter before classification; prewarm: run one
+        # dummy inference up front so the first real frame is not slowed by
+        # model initialisation; motion_gate: reuse the last result instead
+        # of running inference while the scene is not changing;
+        # source_options: keyword arguments for a video file or frame
+        # directory source, e.g. {"realtime": True, "loop": True}.
+        self.players = players
+        if players > 1:
+            # The crop and the worker process both follow a single hand.
+            if roi or use_process:
+                log.warning("roi and use_process support one player only; turned off for %d players", players)
+            roi = use_process = False
+        elif roi and use_process:
+            log.warning("roi is not supported by the inference worker process; turned off")
+            roi = False
+        self.replay = None
+        self.replay_index = 0
+        self.cap = None
+        if isinstance(source, str) and source.endswith(TRACE_EXTENSION):
+            # Landmark replay feeds recorded landmarks straight to the
+            # classifier, so there is no camera and no model to run.
+            self.replay = LandmarkTrace(source)
+            threaded = use_process = False
+        else:
+            self.cap = open_source(source, **(source_options or {}))
+            if not self.cap.isOpened():
+                log.error("Could not open frame source: %s", source)
+                exit()
+            if record is not None:
+                self.cap.recorder = FrameRecorder(record)
+        self.trace_writer = TraceWriter(trace) if trace is not None else None
+        self.roi = RoiTracker() if roi else None
+        self.governor = InferenceGovernor(latency_budget) if latency_budget is not None else None
+        self.motion_gate = MotionGate() if motion_gate else None
+        # Seconds between inferences while no hand is visible, or None to
+        # run on every frame; set per screen, e.g. low in the menu.
+        self.idle_interval = None
+        self.last_inference_time = None
+
+        self.hands = None
+        self.model_complexity = 1
+        if self.replay is None and not use_process:
+            if self.governor is not None:
+                self.model_complexity = self.governor.settings["model_complexity"]
+            self.hands = self._create_hands()
+        self.prev_action = Action.IDLE
+        self.overlay_size = overlay_size
         self.last_frame = None
+        # Reused destination buffers for the full-resolution flip and
+        # colour conversion, allocated on the first frame.
+        self.flipped = None
+        self.rgb = None
+        self.last_landmarks = None
+        self.last_handedness = None
+        self.last_result_time = None
+        # Per-stage durations, plus "age": capture to published action.
+        self.timer = StageTimer()
+        self.player_gestures = [GestureDebouncer(idle=Action.IDLE) for _ in range(players)]
+        self.player_actions = [Action.IDLE] * players
+        self.assigner = PlayerAssigner(players) if players > 1 else None
+        self.predictors = [GesturePredictor() for _ in range(players)] if predict else None
+        self.filters = None
+        if smoothing is not None:
+            self.filters = [OneEuroFilter(**smoothing) for _ in range(players)]
+        # Player 0's stream doubles as the single-player API.
+        self.gestures = self.player_gestures[0]
         self.mode = "menu"
 
         self.extension_threshold_factor = 0.75
         self.thumb_extension_factor_multiplier = 0.9
 
-    def get_distance(self, p1, p2):
-        return np.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+        # Threaded mode: a grabber thread keeps the newest camera frame and a
+        # worker thread runs inference on it, so get_action() never blocks.
+        self.threaded = threaded
+        self.grabber = None
+        self.worker = None
+        self.running = False
+        self.last_frame_id = 0
+        # Held for a whole frame by process_frame() and by reset(), so a
+        # reset from the game thread never lands halfway through a frame the
+        # worker thread is processing.
+        self.frame_lock = threading.Lock()
+        if self.threaded:
+            self.grabber = FrameGrabber(self.cap, timer=self.timer).start()
+
+        # Process mode: inference runs in another process, fed through
+        # shared memory, so it does not compete with the game for the GIL.
+        self.use_process = use_process
+        self.inference = None
+        if self.use_process:
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.inference = InferenceWorker((height, width, 3), self.extension_threshold_factor).start()
+        if prewarm:
+            # Before the worker thread starts, as the model is not
+            # safe to share between threads.
+            self._prewarm()
+        if self.threaded and not self.use_process:
+            self.running = True
+            self.worker = threading.Thread(target=self._process_loop, name="PoseControl", daemon=True)
+            self.worker.start()
+
+    def _prewarm(self, timeout=10.0):
+        if self.hands is not None:
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+            self.hands.process(np.zeros((height, width, 3), dtype=np.uint8))
+        elif self.inference is not None:
+            index = self.inference.acquire_slot()
+            self.inference.slot(index)[...] = 0
+            self.inference.submit(index, time.monotonic(), self.mode, self._tier_settings())
+            deadline = time.monotonic() + timeout
+            while self.inference.poll() is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+    def reset(self):
+        """Forgets all gesture state, e.g. when a new game starts."""
+        with self.frame_lock:
+            self._reset()
+
+    def _reset(self):
+        self.prev_action = Action.IDLE
+        self.player_actions = [Action.IDLE] * self.players
+        for gestures in self.player_gestures:
+            gestures.reset()
+        for predictor in self.predictors or []:
+            predictor.reset()
+        for smoothing_filter in self.filters or []:
+            smoothing_filter.reset()
+        if self.roi is not None:
+            self.roi.box = None
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        self.last_inference_time = None
+
+    def _create_hands(self):
+        return mp.solutions.hands.Hands(
+            max_num_hands=self.players,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.6
+        )
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        self._mode = mode
+        table = GESTURE_TABLES.get(mode)
+        for gestures in self.player_gestures:
+            gestures.configure(**(table.debounce if table is not None else {}))
+
+    def get_confirmed_action(self):
+        """Like get_action(), but returns the debounced action."""
+        self.get_action()
+        return self.gestures.confirmed
+
+    def get_confirmed_actions(self):
+        """Debounced actions of every player, indexed by player ID."""
+        self.get_action()
+        return [gestures.confirmed for gestures in self.player_gestures]
 
     def get_action(self):
+        if self.replay is not None:
+            return self._replay_next()
+
+        if self.use_process:
+            return self._exchange_with_worker()
+
+        if self.threaded:
+            # Latest finished result; the worker thread keeps it fresh.
+            return self.prev_action
+
+        started = time.perf_counter()
         ret, frame = self.cap.read()
+        captured_at = self.cap.captured_at
+        self.timer.record("capture", time.perf_counter() - started)
         if not ret:
             return self.prev_action
+        return self.process_frame(frame, captured_at)
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.last_frame = frame.copy()
-
-        hand_result = self.hands.process(rgb)
-        current_action = "idle"
-
-        index_ext = middle_ext = ring_ext = pinky_ext = thumb_ext = False
-
-        if hand_result.multi_hand_landmarks:
-            hand_landmarks = hand_result.multi_hand_landmarks[0]
-            self.drawing.draw_landmarks(self.last_frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
-            landmarks = hand_landmarks.landmark
-
-            base_size = self.get_distance(
-                landmarks[mp.solutions.hands.HandLandmark.WRIST],
-                landmarks[mp.solutions.hands.HandLandmark.PINKY_MCP]
-            )
-            base_size = base_size if base_size != 0 else 0.001
-
-            def is_finger_extended(tip, mcp):
-                return (self.get_distance(landmarks[tip], landmarks[mcp]) / base_size) > self.extension_threshold_factor
-
-            def is_thumb_extended():
-                tip = landmarks[mp.solutions.hands.HandLandmark.THUMB_TIP]
-                ip = landmarks[mp.solutions.hands.HandLandmark.THUMB_IP]
-                mcp = landmarks[mp.solutions.hands.HandLandmark.THUMB_MCP]
-                wrist_x = landmarks[mp.solutions.hands.HandLandmark.WRIST].x
-                return (tip.x > ip.x > mcp.x) if wrist_x < tip.x else (tip.x < ip.x < mcp.x)
-
-            index_ext = is_finger_extended(mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP, mp.solutions.hands.HandLandmark.INDEX_FINGER_MCP)
-            middle_ext = is_finger_extended(mp.solutions.hands.HandLandmark.MIDDLE_FINGER_TIP, mp.solutions.hands.HandLandmark.MIDDLE_FINGER_MCP)
-            ring_ext = is_finger_extended(mp.solutions.hands.HandLandmark.RING_FINGER_TIP, mp.solutions.hands.HandLandmark.RING_FINGER_MCP)
-            pinky_ext = is_finger_extended(mp.solutions.hands.HandLandmark.PINKY_TIP, mp.solutions.hands.HandLandmark.PINKY_MCP)
-            thumb_ext = is_thumb_extended()
-
-            # 🎮 Game mode gestures (relaxed)
-            if self.mode == "game":
-                if index_ext and middle_ext and not ring_ext:
-                    current_action = "boost"
-                elif index_ext and not middle_ext:
-                    current_action = "jump"
-                elif not index_ext and not middle_ext and not ring_ext and not pinky_ext and not thumb_ext:
-                    current_action = "left"
-                elif index_ext and middle_ext and ring_ext and pinky_ext and thumb_ext:
-                    current_action = "right"
-
-            # Menu mode gestures
-            elif self.mode == "menu":
-                if index_ext and thumb_ext and not middle_ext and not ring_ext and not pinky_ext:
-                    current_action = "confirm_select"
-                elif index_ext and middle_ext and ring_ext and not pinky_ext and not thumb_ext:
-                    current_action = "menu_2"
-                elif index_ext and middle_ext and not ring_ext and not pinky_ext and not thumb_ext:
-                    current_action = "menu_1"
-                elif index_ext and not middle_ext and not ring_ext and not pinky_ext and not thumb_ext:
-                    current_action = "menu_0"
-                elif thumb_ext and not index_ext and not middle_ext and not ring_ext and not pinky_ext:
-                    current_action = "menu_0"
+    def _process_loop(self):
+        frame_id = 0
+        while self.running:
+            frame_id, frame, captured_at = self.grabber.wait_newer(frame_id)
+            if frame is not None:
+                self.process_frame(frame, captured_at)
 
-            # Visual feedback on fingertips
-            fingertip_status = [thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext]
-            fingertip_indices = [4, 8, 12, 16, 20]
-            for i, idx in enumerate(fingertip_indices):
-                cx = int(landmarks[idx].x * self.last_frame.shape[1])
-                cy = int(landmarks[idx].y * self.last_frame.shape[0])
-                color = (0, 255, 0) if fingertip_status[i] else (0, 0, 255)
-                cv2.circle(self.last_frame, (cx, cy), 6, color, -1)
+    def _exchange_with_worker(self):
+        result = self.inference.poll()
+        if result is not None:
+            # The slot is only rewritten by this thread, so its pixels still
+            # match the landmarks until the next submit below.
+            self._apply_result(result, self.inference.slot(result.slot))
 
-        # On-screen debug
-        if self.last_frame is not None:
-            cv2.putText(self.last_frame, f"Mode: {self.mode}", (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(self.last_frame, f"Action: {current_action}", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(self.last_frame,
-                        f"I:{int(index_ext)} M:{int(middle_ext)} R:{int(ring_ext)} P:{int(pinky_ext)} T:{int(thumb_ext)}",
-                        (20, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 1)
+        index = self.inference.acquire_slot()
+        if index is None:
+            return self.prev_action
+
+        slot = self.inference.slot(index)
+        captured_at = None
+        if self.threaded:
+            frame_id, frame, captured_at = self.grabber.latest()
+            if frame is None or frame_id == self.last_frame_id:
+                self.inference.release_slot(index)
+                return self.prev_action
+            self.last_frame_id = frame_id
+            if self._skip_inference(frame, captured_at):
+                self.inference.release_slot(index)
+                return self.prev_action
+            if frame.shape == slot.shape:
+                np.copyto(slot, frame)
+            else:
+                cv2.resize(frame, (slot.shape[1], slot.shape[0]), dst=slot)
+        else:
+            started = time.perf_counter()
+            ret, _ = self.cap.read(slot)
+            captured_at = self.cap.captured_at
+            self.timer.record("capture", time.perf_counter() - started)
+            if not ret or self._skip_inference(slot, captured_at):
+                self.inference.release_slot(index)
+                return self.prev_action
+        self.inference.submit(index, captured_at, self.mode, self._tier_settings())
+        return self.prev_action
+
+    def _tier_settings(self):
+        return self.governor.settings if self.governor is not None else None
 
+    def _apply_result(self, result, frame):
+        timings = dict(result.timings)
+        for stage, seconds in result.timings:
+            self.timer.record(stage, seconds)
+        if self.governor is not None and self.governor.record(timings["convert"] + timings["inference"]):
+            self._apply_tier()
+        points, current_action, fingers = result.landmarks, result.action, result.fingers
+        if self.filters is not None:
+            # The worker classified the raw landmarks; redo it on the
+            # smoothed ones, which costs next to nothing.
+            points = self._smooth(0, points, result.timestamp)
+            if points is not None:
+                current_action, fingers = classify_landmarks(points, self.mode, self.extension_threshold_factor)
+        annotated = None
+        if self.overlay_size is not None:
+            with self.timer.measure("preview"):
+                annotated = self._preview(self._flip(frame), points, fingers, current_action)
+        self._publish(annotated, points, result.handedness, result.timestamp, current_action, fingers)
+
+    def _replay_next(self):
+        if self.replay_index >= len(self.replay):
+            return self.prev_action
+        record = self.replay.records[self.replay_index]
+        self.replay_index += 1
+
+        timestamp = float(record["timestamp"])
+        # Replay in the mode the record was captured in, as the live session
+        # switched; this also gives the debouncers that mode's settings.
+        if record["mode"] >= 0 and MODES[record["mode"]] != self.mode:
+            log.info("Trace switches mode: %s -> %s", self.mode, MODES[record["mode"]])
+            self.mode = MODES[record["mode"]]
+        current_action, fingers, points, handedness = Action.IDLE, (False,) * 5, None, None
+        if record["handedness"] >= 0:
+            points = np.array(record["landmarks"])
+            handedness = HANDEDNESS[record["handedness"]]
+        points = self._smooth(0, points, timestamp)
+        if points is not None:
+            current_action, fingers = classify_landmarks(points, self.mode, self.extension_threshold_factor)
+        self._publish(None, points, handedness, timestamp, current_action, fingers)
+        return current_action
+
+    def _publish(self, annotated, points, handedness, timestamp, current_action, fingers):
+        thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext = fingers
         # Console debug
-        print(f"[Gesture Debug] Mode: {self.mode} | I:{index_ext} M:{middle_ext} R:{ring_ext} P:{pinky_ext} T:{thumb_ext} => Action: {current_action}")
+        log.debug("Mode: %s | I:%s M:%s R:%s P:%s T:%s => Action: %s", self.mode,
+                  index_ext, middle_ext, ring_ext, pinky_ext, thumb_ext, current_action.label)
 
+        if annotated is not None:
+            self.last_frame = annotated
+        self.last_landmarks = points
+        self.last_handedness = handedness
+        self.last_result_time = timestamp
+        if self.replay is None and self.cap.timestamps is None:
+            # Recorded capture times are not on the wall clock of this run.
+            self.timer.record("age", time.monotonic() - timestamp)
         self.prev_action = current_action
+        self.gestures.update(self._predict(0, points, current_action, timestamp), timestamp)
+        if self.trace_writer is not None:
+            self.trace_writer.write(timestamp, points, handedness, self.mode, current_action)
+
+    def _smooth(self, player, points, timestamp):
+        """Runs a player's landmarks through their filter; a lost hand resets it."""
+        if self.filters is None:
+            return points
+        if points is None:
+            self.filters[player].reset()
+            return None
+        return self.filters[player].filter(points, timestamp)
+
+    def _predict(self, player, points, current_action, timestamp):
+        """The action to debounce: the predicted one while a transition is under way."""
+        if self.predictors is None:
+            return current_action
+        features = extract_features(points) if points is not None else None
+        predicted = self.predictors[player].update(features, current_action, timestamp,
+                                                   GESTURE_TABLES.get(self.mode), self.extension_threshold_factor)
+        return predicted if predicted is not None else current_action
+
+    def process_frame(self, frame, captured_at=None):
+        with self.frame_lock:
+            return self._process_frame(frame, captured_at)
+
+    def _process_frame(self, frame, captured_at):
+        timestamp = captured_at if captured_at is not None else time.monotonic()
+        if self._skip_inference(frame, timestamp):
+            return self.prev_action
+
+        with self.timer.measure("flip"):
+            frame = self._flip(frame)
+
+        started = time.perf_counter()
+        hands = self._detect(frame)
+        if self.governor is not None and self.governor.record(time.perf_counter() - started):
+            self._apply_tier()
+        if self.assigner is not None:
+            hands = self.assigner.assign(hands, timestamp)
+        else:
+            hands = (hands + [(None, None)])[:1]
+
+        results = []
+        classify_started = time.perf_counter()
+        for player, (points, handedness) in enumerate(hands):
+            points = self._smooth(player, points, timestamp)
+            action, fingers = Action.IDLE, (False,) * 5
+            if points is not None:
+                action, fingers = classify_landmarks(points, self.mode, self.extension_threshold_factor)
+            self.player_actions[player] = action
+            if player > 0:
+                self.player_gestures[player].update(self._predict(player, points, action, timestamp), timestamp)
+            results.append((points, handedness, action, fingers))
+
+        self.timer.record("classify", time.perf_counter() - classify_started)
+
+        points, handedness, current_action, fingers = results[0]
+        annotated = None
+        if self.overlay_size is not None:
+            others = [other[0] for other in results[1:] if other[0] is not None]
+            with self.timer.measure("preview"):
+                annotated = self._preview(frame, points, fingers, current_action, others)
+        self._publish(annotated, points, handedness, timestamp, current_action, fingers)
         return current_action
 
+    def _skip_inference(self, frame, timestamp):
+        """True if this frame reuses the last result: a governor skip frame,
+        or one _reuse_previous() lets pass."""
+        if self.governor is not None and self.governor.should_skip():
+            self._hold_previous(timestamp)
+            return True
+        return self._reuse_previous(frame, timestamp)
+
+    def _reuse_previous(self, frame, timestamp):
+        """True if the last result stands in for this frame, skipping inference.
+
+        That is the case while the idle interval has not passed without a
+        hand in view, or while the motion gate finds the scene static.
+        """
+        if (self.idle_interval is not None and self.last_landmarks is None
+                and self.last_inference_time is not None
+                and timestamp - self.last_inference_time < self.idle_interval):
+            reuse = True
+        elif self.motion_gate is not None:
+            with self.timer.measure("gate"):
+                reuse = self.motion_gate.is_static(frame, timestamp)
+            if not reuse:
+                self.motion_gate.accept(timestamp)
+        else:
+            reuse = False
+        if not reuse:
+            self.last_inference_time = timestamp
+            return False
+        self._hold_previous(timestamp)
+        return True
+
+    def _hold_previous(self, timestamp):
+        # The debouncers still see the held action, so confirmations and
+        # hold times keep advancing while inference is skipped.
+        self.gestures.update(self.prev_action, timestamp)
+        for player in range(1, self.players):
+            self.player_gestures[player].update(self.player_actions[player], timestamp)
+
+    def _flip(self, frame):
+        if self.flipped is None or self.flipped.shape != frame.shape:
+            self.flipped = np.empty_like(frame)
+        return cv2.flip(frame, 1, dst=self.flipped)
+
+    def _to_rgb(self, image):
+        if image is not self.flipped:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if self.rgb is None or self.rgb.shape != image.shape:
+            self.rgb = np.empty_like(image)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.rgb)
+
+    def _detect(self, frame):
+        """Runs the hand model; returns a (landmarks, handedness) pair per hand."""
+        region = None
+        image = frame
+        if self.roi is not None:
+            image, region = self.roi.crop(frame)
+
+        if self.governor is not None and self.governor.settings["scale"] < 1.0:
+            scale = self.governor.settings["scale"]
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        with self.timer.measure("convert"):
+            rgb = self._to_rgb(image)
+        with self.timer.measure("inference"):
+            hand_result = self.hands.process(rgb)
+        if not hand_result.multi_hand_landmarks and region is not None:
+            # Lost the hand inside the crop: search the whole frame again.
+            region = None
+            with self.timer.measure("convert"):
+                rgb = self._to_rgb(frame)
+            with self.timer.measure("inference"):
+                hand_result = self.hands.process(rgb)
+
+        hands = []
+        for index, hand_landmarks in enumerate(hand_result.multi_hand_landmarks or []):
+            points = landmarks_to_array(hand_landmarks.landmark)
+            if self.roi is not None:
+                points = self.roi.to_full(points, region, frame.shape)
+            handedness = None
+            if hand_result.multi_handedness and index < len(hand_result.multi_handedness):
+                handedness = hand_result.multi_handedness[index].classification[0].label
+            hands.append((points, handedness))
+        if self.roi is not None:
+            self.roi.update(hands[0][0] if hands else None, frame.shape)
+        return hands
+
+    def _apply_tier(self):
+        complexity = self.governor.settings["model_complexity"]
+        if complexity != self.model_complexity:
+            self.model_complexity = complexity
+            # The worker process switches models itself, from the settings
+            # sent with each frame.
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = self._create_hands()
+            if self.roi is not None:
+                self.roi.box = None
+
+    def governor_stats(self):
+        """Current quality tier and measured inference times, or None."""
+        if self.governor is None:
+            return None
+        return self.governor.stats()
+
+    def timing_stats(self):
+        """Rolling p50/p95/p99 in ms for each pipeline stage.
+
+        Stages are capture, flip, convert, inference, classify and preview;
+        "age" is the time from frame capture to the action being published.
+        """
+        return self.timer.stats()
+
+    def action_age(self):
+        """Seconds since the frame behind the current action was captured."""
+        if self.last_result_time is None or self.replay is not None or self.cap.timestamps is not None:
+            return None
+        return time.monotonic() - self.last_result_time
+
+    def motion_gate_stats(self):
+        """Frames checked and skipped by the motion gate, or None."""
+        if self.motion_gate is None:
+            return None
+        return self.motion_gate.stats()
+
+    def prediction_stats(self):
+        """Confirmed/wrong prediction counts per player, or None."""
+        if self.predictors is None:
+            return None
+        return [predictor.stats() for predictor in self.predictors]
+
+    def _preview(self, frame, points, fingers, current_action, others=()):
+        """Draws the debug annotations on a thumbnail of the frame."""
+        annotated = cv2.resize(frame, self.overlay_size, interpolation=cv2.INTER_AREA)
+        thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext = fingers
+        height, width = annotated.shape[:2]
+
+        for other in others:
+            pixels = (other[:, :2] * (width, height)).astype(int)
+            for start, end in HAND_CONNECTIONS:
+                cv2.line(annotated, tuple(pixels[start]), tuple(pixels[end]), (255, 160, 0), 1)
+
+        if points is not None:
+            pixels = (points[:, :2] * (width, height)).astype(int)
+            for start, end in HAND_CONNECTIONS:
+                cv2.line(annotated, tuple(pixels[start]), tuple(pixels[end]), (255, 255, 255), 1)
+
+            # Visual feedback on fingertips
+            for extended, idx in zip(fingers, FINGERTIP_INDICES):
+                color = (0, 255, 0) if extended else (0, 0, 255)
+                cv2.circle(annotated, tuple(pixels[idx]), 2, color, -1)
+
+        # On-screen debug
+        cv2.putText(annotated, f"Mode: {self.mode}", (4, 10), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 0), 1)
+        cv2.putText(annotated, f"Action: {current_action.label}", (4, 21), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 0), 1)
+        cv2.putText(annotated,
+                    f"I:{int(index_ext)} M:{int(middle_ext)} R:{int(ring_ext)} P:{int(pinky_ext)} T:{int(thumb_ext)}",
+                    (4, 32), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 0), 1)
+        return annotated
+
     def release(self):
-        self.cap.release()
-        cv2.destroyAllWindows()
+        if self.threaded:
+            self.running = False
+            self.grabber.stop()
+            if self.worker is not None:
+                self.worker.join(timeout=1.0)
+        if self.inference is not None:
+            self.inference.stop()
+        if self.hands is not None:
+            self.hands.close()
+        if self.trace_writer is not None:
+            self.trace_writer.close()
+        if self.cap is not None:
+            self.cap.release()
@@ -0,0 +1,73 @@
+from classes.GestureDebouncer import GestureDebouncer
+
+
+def feed(debouncer, pattern, start, step=0.01):
+    """Feeds ``pattern`` one action per ``step`` seconds; returns the end time."""
+    timestamp = start
+    for action in pattern:
+        debouncer.update(action, timestamp)
+        timestamp += step
+    return timestamp
+
+
+def test_confirms_once_enter_share_is_reached():
+    debouncer = GestureDebouncer(window=0.1, enter=0.6, exit=0.3)
+    feed(debouncer, ["right"] * 10, 0.0)
+    assert debouncer.confirmed == "right"
+
+
+def test_exit_threshold_holds_confirmed_action_in_borderline_mix():
+    debouncer = GestureDebouncer(window=0.1, enter=0.6, exit=0.3)
+    now = feed(debouncer, ["right"] * 10, 0.0)
+    debouncer.pop_events()
+
+    # "left" leads with 60% of the window, but "right" keeps 40%, above its
+    # exit threshold, so it stays confirmed.
+    feed(debouncer, ["left", "right", "left", "right", "left"] * 10, now)
+    assert debouncer.confirmed == "right"
+    assert debouncer.pop_events() == []
+
+
+def test_releases_to_leader_below_exit_threshold():
+    debouncer = GestureDebouncer(window=0.1, enter=0.6, exit=0.3)
+    now = feed(debouncer, ["right"] * 10, 0.0)
+    debouncer.pop_events()
+
+    feed(debouncer, ["left", "left", "left", "left", "right"] * 10, now)
+    assert debouncer.confirmed == "left"
+    assert [action for _, action in debouncer.pop_events()] == ["left"]
+
+
+def test_releases_to_idle_when_no_action_qualifies():
+    debouncer = GestureDebouncer(window=0.1, enter=0.6, exit=0.3, idle="idle")
+    now = feed(debouncer, ["right"] * 10, 0.0)
+
+    # Neither "left" nor "jump" reaches 60%, but "right" is gone.
+    feed(debouncer, ["left", "jump"] * 20, now)
+    assert debouncer.confirmed == "idle"
+
+
+def test_per_action_exit_threshold():
+    debouncer = GestureDebouncer(window=0.1, enter=0.6, exit=0.3, thresholds={"right": (0.6, 0.5, 0.0)})
+    now = feed(debouncer, ["right"] * 10, 0.0)
+
+    # 40% is enough to hold with the default exit, not with right's own 0.5.
+    feed(debouncer, ["left", "right", "left", "right", "left"] * 10, now)
+    assert debouncer.confirmed == "left"
+
+
+def frames_until_confirmed(action, enter):
+    """Frames at 30 fps from idle until ``action`` is confirmed."""
+    debouncer = GestureDebouncer(window=0.15, enter=0.6, exit=0.3, thresholds={"jump": (enter, 0.2, 0.0)})
+    now = feed(debouncer, ["idle"] * 10, 0.0, step=1 / 30)
+    for frame in range(1, 20):
+        if debouncer.update(action, now) == action:
+            return frame
+        now += 1 / 30
+    return None
+
+
+def test_lower_enter_threshold_confirms_sooner_from_idle():
+    jump = frames_until_confirmed("jump", enter=0.4)
+    right = frames_until_confirmed("right", enter=0.4)
+    assert jump < right
@@ -1,5 +1,9 @@
 from pygame.transform import flip
 
+from classes import Log
+
+log = Log.getLogger("traits")
+
 class GoTrait:
     def __init__(self, animation, screen, camera, ent):
         self.animation = animation
@@ -13,17 +17,17 @@ class GoTrait:
         self.camera = camera
         self.entity = ent
 
-    def update(self):
+    def step(self):
     # === BOOST MODE LOGIC ===
         if self.boost:
             self.maxVel = 6.0
             self.animation.deltaTime = 3
-            print("[DEBUG] BOOST is active! Max speed set to:", self.maxVel)
+            log.debug("BOOST is active! Max speed set to: %s", self.maxVel)
 
             # FORCE boost speed directly
             if self.direction != 0:
                 self.entity.vel.x = self.maxVel * self.direction
-                print("[DEBUG] FORCE boost velocity:", self.entity.vel.x)
+                log.debug("FORCE boost velocity: %s", self.entity.vel.x)
         else:
             self.maxVel = 3.2
             self.animation.deltaTime = 7
@@ -61,17 +65,12 @@ class GoTrait:
             else:
                 self.animation.idle()
 
-        # === DRAW ===
-        if (self.entity.invincibilityFrames // 2) % 2 == 0:
-            self.drawEntity()
-
-
     def updateAnimation(self, animation):
         self.animation = animation
-        self.update()
+        self.step()
 
-    def drawEntity(self):
+    def draw(self, pos):
         if self.heading == 1:
-            self.screen.blit(self.animation.image, self.entity.getPos())
+            self.screen.blit(self.animation.image, pos)
         else:
-            self.screen.blit(flip(self.animation.image, True, False), self.entity.getPos())
+            self.screen.blit(flip(self.animation.image, True, False), pos)
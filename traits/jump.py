@@ -1,6 +1,11 @@
+from classes import Log
+
+log = Log.getLogger("traits")
+
+
 class JumpTrait:
     def __init__(self, entity):
-        print("[INIT] JumpTrait instance created. Method reference:", self.handle_jump)
+        log.debug("JumpTrait instance created. Method reference: %s", self.handle_jump)
         self.verticalSpeed = -12
         self.jumpHeight = 120
         self.entity = entity
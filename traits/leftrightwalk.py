@@ -1,17 +1,16 @@
-import random
-
 from classes.Collider import Collider
 
 
 class LeftRightWalkTrait:
     def __init__(self, entity, level):
-        self.direction = random.choice([-1, 1])
+        # The level's generator, so a recorded seed replays the same walks.
+        self.direction = level.random.choice([-1, 1])
         self.entity = entity
         self.collDetection = Collider(self.entity, level)
         self.speed = 1
         self.entity.vel.x = self.speed * self.direction
 
-    def update(self):
+    def step(self):
         if self.entity.vel.x == 0:
             self.direction *= -1
         self.entity.vel.x = self.speed * self.direction